@@ -0,0 +1,516 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from suffix_trie import Trie, Suffix_Trie, Prefix_Trie, SequenceDatabase, OrfFinder
+
+# length of the genome and number of reads for each scale
+SCALES = {
+    "small": {"genome": 300, "reads": 500, "read_length": 40, "queries": 200},
+    "medium": {"genome": 1000, "reads": 2000, "read_length": 80, "queries": 500},
+    "large": {"genome": 20000, "reads": 10000, "read_length": 100, "queries": 1000},
+}
+
+# the Suffix Trie and Prefix Trie have O(N^2) Nodes, they are skipped for a longer genome
+TRIE_LIMIT = 2000
+
+# a change smaller than this is not a regression whatever the ratio, sub-millisecond timings move more than 25%
+# from one run to the next on an unchanged tree
+FLOORS = {"build_s": 0.005, "peak_bytes": 64 * 1024, "nodes_per_char": 0.0, "p50_us": 20.0}
+
+# the largest run to run spread (slowest / fastest) that compare accepts as noise
+MAX_SPREAD = 2.0
+
+
+def random_string(rng, length, letters="ABCD"):
+
+    """
+    Input: rng is a random.Random, length of the string, letters to choose from
+    Output: a random string of the given length
+    """
+
+    return "".join(rng.choice(letters) for _ in range(length))
+
+def repetitive_string(rng, length, letters="ABCD", unit=12, mutation=0.01):
+
+    """
+    Input: rng, length, letters, unit is the length of the repeated piece, mutation is the chance a letter is changed
+    Output: a string made of one random piece repeated (a tandem repeat) with a few point mutations
+    """
+
+    piece = random_string(rng, unit, letters)
+    out = list((piece * (length // unit + 1))[:length])
+    for i in range(length):
+        if rng.random() < mutation:
+            out[i] = rng.choice(letters)
+    return "".join(out)
+
+def motif_string(rng, length, letters="ABCD", motifs=("ABC", "BDA", "DCA", "CAB"), density=0.2):
+
+    """
+    Input: rng, length, letters, motifs to plant, density is the chance a motif starts at each position
+    Output: a random string where the motifs appear much more often than by chance, like the start and stop codons
+            of a gene-dense genome
+    """
+
+    out = []
+    while len(out) < length:
+        if rng.random() < density:
+            out.extend(rng.choice(motifs))
+        else:
+            out.append(rng.choice(letters))
+    return "".join(out[:length])
+
+GENERATORS = {
+    "random": random_string,
+    "repetitive": repetitive_string,
+    "motif": motif_string,
+}
+
+def read_set(rng, genome, count, length, error=0.01, letters="ABCD"):
+
+    """
+    Input: rng, genome to sample from, count and length of the reads, error is the chance a letter is misread
+    Output: a list of reads, each a piece of the genome with a few errors, the same read can appear more than once
+    """
+
+    reads = []
+    for _ in range(count):
+        start = rng.randrange(max(1, len(genome) - length + 1))
+        read = list(genome[start:start + length])
+        for i in range(len(read)):
+            if rng.random() < error:
+                read[i] = rng.choice(letters)
+        reads.append("".join(read))
+    return reads
+
+def best_time(function, repeat):
+
+    """
+    Input: function with no argument, repeat is the number of times to run it
+    Output: the fastest run time in seconds
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+def median_time(function, repeat, collector=False):
+
+    """
+    Input: function with no argument, repeat is the number of times to run it, collector is True to leave the garbage
+           collector on
+    Output: the median run time in seconds, it moves less between runs than the fastest one
+
+    The garbage collector is turned off while the function runs (like timeit), a collection that happens to land in one
+    run would make it slower by more than the threshold of compare(). It is left on for a function whose time depends on
+    it, like bulk_load which pauses it itself.
+    """
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        if not collector:
+            gc.disable()
+        try:
+            begin = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - begin)
+        finally:
+            gc.enable()
+    times.sort()
+    return times[len(times) // 2]
+
+def calibrate(repeat=5):
+
+    """
+    Input: repeat is the number of runs
+    Output: the median time in seconds of a fixed piece of Python work, it is measured next to the timings of each row
+            and compare() scales the timings by it, so a machine that is slower at that moment doesn't look like a regression
+    """
+
+    def work():
+        table = {}
+        for i in range(200000):
+            table[i & 1023] = str(i)
+
+    return median_time(work, repeat)
+
+def peak_memory(function):
+
+    """
+    Input: function with no argument
+    Output: the result of the function and the peak memory in bytes allocated while it runs (tracemalloc)
+    """
+
+    tracemalloc.start()
+    try:
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+def latency(function, queries, repeat=1, prefix=""):
+
+    """
+    Input: function of one argument, queries is the list of arguments, repeat is the number of times each query is run
+           (the fastest is kept), prefix is added to the front of each name
+    Output: a dict with the 50th, 90th and 99th percentile and the largest time of one call in microseconds
+
+    The garbage collector is off while the queries run, the same as median_time.
+    """
+
+    times = [float("inf")] * len(queries)
+    gc.collect()
+    gc.disable()
+    try:
+        # every query is run once in each round, so the runs of one query are spread over the whole measurement and
+        # a few slow moments of the machine don't make all of them slow
+        for _ in range(repeat):
+            for i, query in enumerate(queries):
+                begin = time.perf_counter()
+                function(query)
+                times[i] = min(times[i], time.perf_counter() - begin)
+    finally:
+        gc.enable()
+    times.sort()
+    pick = lambda fraction: times[min(len(times) - 1, int(fraction * len(times)))] * 1e6
+    return {prefix + "p50_us": pick(0.5), prefix + "p90_us": pick(0.9), prefix + "p99_us": pick(0.99),
+            prefix + "max_us": times[-1] * 1e6}
+
+def count_nodes(root):
+
+    """
+    Input: the root of a Trie, Suffix Trie or Prefix Trie (or their Radix version)
+    Output: the number of Nodes, terminal Nodes included
+    """
+
+    count = 0
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        count += 1
+        stack.extend(child for child in current.link if child is not None)
+    return count
+
+def bench_insert(seed=0, repeat=5):
+
+    """
+    Input: seed for the random strings, repeat is the number of runs for each measurement
+    Output: a list of dict, one for each structure and length, with the time per character of the recursive
+            and iterative insertion and the speedup
+
+    The keys are kept below the recursion limit so the recursive version can still run.
+    """
+
+    rng = random.Random(seed)
+    results = []
+
+    for length in (100, 400, 800):
+        keys = [random_string(rng, length) for _ in range(50)]
+
+        def recursive():
+            trie = Trie()
+            for key in keys:
+                trie.insert_recur(key)
+
+        def iterative():
+            trie = Trie()
+            for key in keys:
+                trie.insert_iter(key)
+
+        results.append(_row("Trie", length, len(keys) * length, best_time(recursive, repeat), best_time(iterative, repeat)))
+
+    for length in (100, 300, 600):
+        genome = random_string(rng, length)
+
+        def suffix_recursive():
+            Suffix_Trie().suffix_insert_recur(genome)
+
+        def suffix_iterative():
+            Suffix_Trie().suffix_insert_iter(genome)
+
+        def prefix_recursive():
+            Prefix_Trie().prefix_insert_recur(genome)
+
+        def prefix_iterative():
+            Prefix_Trie().prefix_insert_iter(genome)
+
+        # number of characters walked over all the suffixes/prefixes
+        chars = length * (length + 1) // 2
+        results.append(_row("Suffix_Trie", length, chars, best_time(suffix_recursive, repeat), best_time(suffix_iterative, repeat)))
+        results.append(_row("Prefix_Trie", length, chars, best_time(prefix_recursive, repeat), best_time(prefix_iterative, repeat)))
+
+    return results
+
+def _row(name, length, chars, recursive, iterative):
+    return {
+        "structure": name,
+        "length": length,
+        "recursive_ns_per_char": recursive / chars * 1e9,
+        "iterative_ns_per_char": iterative / chars * 1e9,
+        "speedup": recursive / iterative,
+    }
+
+def bench_database(scale, kind, seed=0, repeat=5):
+
+    """
+    Input: scale is a key of SCALES, kind is a key of GENERATORS, seed for the data, repeat is the number of build runs
+    Output: a list of dict, one for each storage of SequenceDatabase, with the median build time, peak memory, Nodes per
+            character of the reads and the latency of query, and the build time of the distinct reads with addSequence
+            and with bulk_load, where counting the repeated reads first saves nothing
+    """
+
+    size = SCALES[scale]
+    rng = random.Random(seed)
+    genome = GENERATORS[kind](rng, size["genome"])
+    reads = read_set(rng, genome, size["reads"], size["read_length"])
+    queries = [read[:rng.randint(1, len(read))] for read in rng.sample(reads, min(size["queries"], len(reads)))]
+    chars = sum(len(read) for read in reads)
+    unique = list(dict.fromkeys(reads))
+
+    results = []
+    for storage in ("node", "radix", "array"):
+
+        def build():
+            database = SequenceDatabase(storage)
+            for read in reads:
+                database.addSequence(read)
+            return database
+
+        def unique_build():
+            database = SequenceDatabase(storage)
+            for read in unique:
+                database.addSequence(read)
+            return database
+
+        def unique_bulk():
+            database = SequenceDatabase(storage)
+            database.bulk_load(unique)
+            return database
+
+        database, peak = peak_memory(build)
+        calibration = calibrate(repeat)
+        if storage == "array":
+            nodes = len(database.db.word)
+        else:
+            nodes = count_nodes(database.db.root)
+        row = {
+            "benchmark": "database",
+            "scale": scale,
+            "data": kind,
+            "structure": storage,
+            "chars": chars,
+            "calibration_s": calibration,
+            "build_s": median_time(build, repeat),
+            "peak_bytes": peak,
+            "nodes_per_char": nodes / chars,
+            # with the garbage collector on, the way a caller runs them
+            "unique_build_s": median_time(unique_build, repeat, collector=True),
+            "unique_bulk_s": median_time(unique_bulk, repeat, collector=True),
+        }
+        row.update(latency(database.query, queries, repeat))
+        results.append(row)
+    return results
+
+def bench_orf_finder(scale, kind, seed=0, repeat=5):
+
+    """
+    Input: scale is a key of SCALES, kind is a key of GENERATORS, seed for the data, repeat is the number of build runs
+    Output: a list of dict, one for each backend of OrfFinder, with the median build time, peak memory, Nodes per character
+            of the genome (None for the suffix array) and the latency of find, and of count as count_p50_us and so on
+    """
+
+    size = SCALES[scale]
+    rng = random.Random(seed)
+    genome = GENERATORS[kind](rng, size["genome"])
+    pairs = [(random_string(rng, rng.randint(1, 3)), random_string(rng, rng.randint(1, 3))) for _ in range(size["queries"])]
+
+    results = []
+    for backend in ("trie", "radix", "suffix_array", "suffix_tree"):
+        if backend == "trie" and len(genome) > TRIE_LIMIT:
+            continue
+
+        def build():
+            return OrfFinder(genome, backend=backend)
+
+        finder, peak = peak_memory(build)
+        calibration = calibrate(repeat)
+        if backend == "suffix_array":
+            nodes = None
+        elif backend == "suffix_tree":
+            # one Suffix Tree is both indexes
+            nodes = count_nodes(finder.suffix_index.root) / len(genome)
+        else:
+            nodes = (count_nodes(finder.suffix_index.root) + count_nodes(finder.prefix_index.root)) / len(genome)
+        row = {
+            "benchmark": "orf_finder",
+            "scale": scale,
+            "data": kind,
+            "structure": backend,
+            "chars": len(genome),
+            "calibration_s": calibration,
+            "build_s": median_time(build, repeat),
+            "peak_bytes": peak,
+            "nodes_per_char": nodes,
+        }
+        row.update(latency(lambda pair: finder.find(*pair), pairs, repeat))
+        row.update(latency(lambda pair: finder.count(*pair), pairs, repeat, "count_"))
+        results.append(row)
+    return results
+
+def run(scales, seed=0, repeat=5):
+
+    """
+    Input: scales is a list of keys of SCALES, seed for the data, repeat is the number of runs of each build
+    Output: a dict with the environment and every result, it can be written as JSON and compared with compare()
+    """
+
+    results = []
+    for scale in scales:
+        for kind in GENERATORS:
+            results.extend(bench_database(scale, kind, seed, repeat))
+            results.extend(bench_orf_finder(scale, kind, seed, repeat))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+        "insert": bench_insert(seed, repeat),
+    }
+
+def _key(row):
+    return (row["benchmark"], row["scale"], row["data"], row["structure"])
+
+def compare(old, new, threshold=1.25, floors=FLOORS):
+
+    """
+    Input: old and new are outputs of run(), threshold is the ratio new / old that counts as a regression,
+           floors is the smallest change of each metric that counts as a regression
+    Output: a list of (benchmark, scale, data, structure, metric, old value, new value) that got worse by more than
+            threshold and by more than the floor
+
+    Only the rows that are in both runs are compared. Build time, peak memory, Nodes per character and the median
+    query time are checked, the other percentiles are too noisy for a fixed threshold. The timings of the new run are
+    scaled by the calibration of the two rows first, and a timing only counts when it got worse by more than the spread
+    (slowest / fastest) of its runs in either report, up to MAX_SPREAD.
+    """
+
+    old_rows = {_key(row): row for row in old["results"]}
+    regressions = []
+    for row in new["results"]:
+        before = old_rows.get(_key(row))
+        if before is None:
+            continue
+        # a row without a calibration (from an older report) is compared as it is
+        speed = before["calibration_s"] / row["calibration_s"] if "calibration_s" in before else 1.0
+        for metric in ("build_s", "peak_bytes", "nodes_per_char", "p50_us"):
+            value = row[metric]
+            limit = threshold
+            if value is not None and metric in ("build_s", "p50_us"):
+                value *= speed
+                # a timing that moved this much between the runs of one report is noise, not a regression,
+                # but twice as slow always counts
+                spread = max(before.get("spread", {}).get(metric, 1.0), row.get("spread", {}).get(metric, 1.0))
+                limit = max(limit, min(spread, MAX_SPREAD))
+            if before[metric] and value is not None and value > before[metric] * limit and value - before[metric] > floors[metric]:
+                regressions.append(_key(row) + (metric, before[metric], value))
+    return regressions
+
+def median_of_runs(reports):
+
+    """
+    Input: a list of outputs of run() with the same rows
+    Output: the first report with each timing (and the calibration) replaced by the median of all the reports, one run
+            can be 30% faster or slower than the next on a busy machine, the median of a few runs is much steadier,
+            spread of each row is the slowest / fastest run of each timing
+    """
+
+    tables = [{_key(row): row for row in report["results"]} for report in reports]
+    merged = dict(reports[0])
+    merged["runs"] = len(reports)
+    merged["results"] = []
+    for row in reports[0]["results"]:
+        row = dict(row)
+        row["spread"] = {}
+        for metric in ("build_s", "p50_us", "count_p50_us", "unique_build_s", "unique_bulk_s", "calibration_s"):
+            if metric in row:
+                values = sorted(table[_key(row)][metric] for table in tables if _key(row) in table)
+                row[metric] = values[len(values) // 2]
+                if values[0] > 0:
+                    row["spread"][metric] = values[-1] / values[0]
+        merged["results"].append(row)
+    return merged
+
+def _print_results(report):
+    print("%-10s %-6s %-10s %-12s %10s %10s %8s %9s %9s" % ("benchmark", "scale", "data", "structure", "build ms",
+                                                            "peak KiB", "nodes/ch", "p50 us", "p99 us"))
+    for row in report["results"]:
+        nodes = "-" if row["nodes_per_char"] is None else "%.2f" % row["nodes_per_char"]
+        print("%-10s %-6s %-10s %-12s %10.1f %10d %8s %9.1f %9.1f" % (row["benchmark"], row["scale"], row["data"],
+                                                                       row["structure"], row["build_s"] * 1e3,
+                                                                       row["peak_bytes"] // 1024, nodes, row["p50_us"],
+                                                                       row["p99_us"]))
+    print()
+    print("%-12s %8s %14s %14s %8s" % ("structure", "length", "recur ns/char", "iter ns/char", "speedup"))
+    for row in report["insert"]:
+        print("%-12s %8d %14.1f %14.1f %7.2fx" % (row["structure"], row["length"], row["recursive_ns_per_char"],
+                                                   row["iterative_ns_per_char"], row["speedup"]))
+    print()
+    print("%-6s %-10s %-12s %16s %16s %8s" % ("scale", "data", "storage", "distinct add ms", "distinct bulk ms", "speedup"))
+    for row in report["results"]:
+        if "unique_bulk_s" in row:
+            print("%-6s %-10s %-12s %16.1f %16.1f %7.2fx" % (row["scale"], row["data"], row["structure"],
+                                                            row["unique_build_s"] * 1e3, row["unique_bulk_s"] * 1e3,
+                                                            row["unique_build_s"] / row["unique_bulk_s"]))
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the Trie, SequenceDatabase and OrfFinder.")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES),
+                        help="data scale to run, can be given more than once (default: small and medium)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated data")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="number of runs of each build (the median is kept) and of each query (the fastest is kept)")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare with the JSON of an earlier run and exit with 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio to the earlier run that counts as a regression")
+    parser.add_argument("--runs", type=int, default=3, help="number of runs, the median timing of the runs is kept")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="number of extra runs when --compare finds a regression, the median of all the runs is compared again")
+    args = parser.parse_args(argv)
+
+    scales = args.scale or ["small", "medium"]
+    reports = [run(scales, args.seed, args.repeat) for _ in range(args.runs)]
+    report = median_of_runs(reports)
+    _print_results(report)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=1)
+
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        regressions = compare(old, report, args.threshold)
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            reports.append(run(scales, args.seed, args.repeat))
+            report = median_of_runs(reports)
+            regressions = compare(old, report, args.threshold)
+        for regression in regressions:
+            print("regression: %s %s %s %s %s %.4g -> %.4g" % regression)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
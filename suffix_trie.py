@@ -1,3 +1,433 @@
+import asyncio
+import gc
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+class Alphabet:
+    
+    """
+    This class describes the letters a Trie, Suffix Trie or Prefix Trie can store.
+    The letter symbols[i] has the index i + 1 in the link of a Node, index 0 is still the terminal, so a Node needs
+    a link of size len(symbols) + 1.
+    
+    symbols: the letters of the alphabet, each one is a single character with a code below 256
+    size: the size of the link of a Node
+    table: a translation table for bytes.translate, table[ord(letter)] is the index of the letter, 0 if it is not in the alphabet
+    """
+    
+    def __init__(self, symbols):
+        
+        """
+        Input: symbols, a string of distinct letters (at most 255)
+        
+        Time Complexity: O(N) where N is the number of letters
+        Space Complexity: O(1) the table always has 256 entries
+        """
+        
+        if len(set(symbols)) != len(symbols) or len(symbols) > 255:
+            raise ValueError("an alphabet needs at most 255 distinct letters")
+        table = bytearray(256)
+        for i, char in enumerate(symbols):
+            if not 0 < ord(char) < 256:
+                raise ValueError("letter %r can't be in an alphabet" % (char,))
+            table[ord(char)] = i + 1
+        self.symbols = symbols
+        self.size = len(symbols) + 1
+        self.table = bytes(table)
+    
+    def __repr__(self):
+        return "Alphabet(%r)" % (self.symbols,)
+    
+    def encode(self, key):
+        
+        """
+        Input: a string
+        Output: bytes with the index of each letter of the string, iterating it gives the index as int
+        
+        The whole string is translated at once with bytes.translate, so the loops that walk the Trie only index a list.
+        A letter that is not in the alphabet raises ValueError.
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        try:
+            codes = key.encode("latin-1").translate(self.table)
+        except UnicodeEncodeError:
+            codes = bytes(1 if ord(char) < 256 and self.table[ord(char)] else 0 for char in key)
+        if 0 in codes:
+            position = codes.index(0)
+            raise ValueError("letter %r at position %d is not in %r" % (key[position], position, self))
+        return codes
+    
+    def index(self, char):
+        
+        """
+        Input: a single letter
+        Output: the index of the letter in the link of a Node, ValueError if it is not in the alphabet
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        index = self.table[ord(char)] if ord(char) < 256 else 0
+        if index == 0:
+            raise ValueError("letter %r is not in %r" % (char, self))
+        return index
+
+# the letters A-D used by the original assignment, this is the default so index 1 = A, index 2 = B, index 3 = C, index 4 = D
+ABCD = Alphabet("ABCD")
+DNA = Alphabet("ACGT")
+# nucleotides with the IUPAC ambiguity codes
+IUPAC = Alphabet("ACGTURYSWKMBDHVN")
+# the 20 amino acids
+PROTEIN = Alphabet("ACDEFGHIKLMNPQRSTVWY")
+# any byte except 0
+BYTES = Alphabet("".join(map(chr, range(1, 256))))
+
+class Metrics:
+    
+    """
+    This class collects what a SequenceDatabase, Suffix Trie, Prefix Trie or OrfFinder does, when it is given one.
+    Without a Metrics object the only cost is checking that the metrics variable is None.
+    
+    counters: a dict of name to the total, for example the number of substrings find returned
+    summaries: a dict of name to [count, sum, max, label of the max], for timings in seconds and sizes
+    gauges: a dict of name to a function, the function is only called when the metrics are exported, so the size of a
+            structure is not computed while it is being built, a function can return a dict to give several values
+            from one call
+    
+    One Metrics object can be shared by many structures and threads, each name starts with the structure it belongs to.
+    The counters and summaries of structures of the same kind are added together, the gauges are for one structure, so
+    each structure gets its own name from unique_name, like sequence_database and then sequence_database_2.
+    """
+    
+    def __init__(self):
+        
+        """
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.counters = {}
+        self.summaries = {}
+        self.gauges = {}
+        self._names = {}
+        self._lock = threading.Lock()
+    
+    def count(self, name, value=1):
+        
+        """
+        Input: name of the counter and the value to add
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def observe(self, name, value, label=None):
+        
+        """
+        Input: name of the summary, value is a timing or a size, label is what the value belongs to (like the query)
+               and is kept if it is the largest value so far, so the slowest query can be found
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            summary = self.summaries.get(name)
+            if summary is None:
+                self.summaries[name] = [1, value, value, label]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value > summary[2]:
+                    summary[2] = value
+                    summary[3] = label
+    
+    def unique_name(self, name):
+        
+        """
+        Input: the name of a kind of structure, like "sequence_database"
+        Output: name the first time, then name_2, name_3 and so on, the name of the gauges of one structure
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            count = self._names.get(name, 0) + 1
+            self._names[name] = count
+        return name if count == 1 else "%s_%d" % (name, count)
+    
+    def gauge(self, name, function):
+        
+        """
+        Input: name of the gauge and a function with no argument that returns its value, or a dict of values that are
+               exported as name_key, so the Nodes and bytes of a structure come from one walk
+        Output: add the gauge, a name that is already a gauge raises ValueError instead of replacing the other gauge
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            if name in self.gauges:
+                raise ValueError("gauge %r is already registered, use unique_name for each structure" % (name,))
+            self.gauges[name] = function
+    
+    def as_dict(self):
+        
+        """
+        Output: a dict with the counters, the summaries (count, sum, max and max_label) and the value of each gauge
+        
+        Time Complexity: O(N + G) where N is the number of names and G is the time of the gauge functions
+        Space Complexity: O(N) where N is the number of names
+        """
+        
+        with self._lock:
+            counters = dict(self.counters)
+            summaries = {name: {"count": count, "sum": total, "max": largest, "max_label": label}
+                         for name, (count, total, largest, label) in self.summaries.items()}
+            gauges = list(self.gauges.items())
+        # the functions are called outside the lock, a gauge can take long or add its own metrics
+        values = {}
+        for name, function in gauges:
+            value = function()
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    values["%s_%s" % (name, key)] = item
+            else:
+                values[name] = value
+        return {"counters": counters, "summaries": summaries, "gauges": values}
+    
+    def prometheus(self, prefix=""):
+        
+        """
+        Input: prefix is added to the front of every name
+        Output: the metrics in the Prometheus text format, a summary is written as name_count and name_sum, and its max as
+                a separate gauge name_max, the label of the max is only in as_dict, as a label every new max would be a
+                new series
+        
+        Time Complexity: O(N + G) where N is the number of names and G is the time of the gauge functions
+        Space Complexity: O(N) where N is the number of names
+        """
+        
+        data = self.as_dict()
+        lines = []
+        for name, value in sorted(data["counters"].items()):
+            lines.append("# TYPE %s%s counter" % (prefix, name))
+            lines.append("%s%s %s" % (prefix, name, value))
+        for name, summary in sorted(data["summaries"].items()):
+            lines.append("# TYPE %s%s summary" % (prefix, name))
+            lines.append("%s%s_count %s" % (prefix, name, summary["count"]))
+            lines.append("%s%s_sum %r" % (prefix, name, summary["sum"]))
+            lines.append("# TYPE %s%s_max gauge" % (prefix, name))
+            lines.append("%s%s_max %r" % (prefix, name, summary["max"]))
+        for name, value in sorted(data["gauges"].items()):
+            lines.append("# TYPE %s%s gauge" % (prefix, name))
+            lines.append("%s%s %r" % (prefix, name, value))
+        return "\n".join(lines) + "\n"
+
+def _structure_size(structure):
+    
+    """
+    Input: a Trie, Array_Trie, Suffix Trie, Prefix Trie (or their Radix version), Suffix Array or Prefix Array
+    Output: (number of Nodes, bytes), the number of entries of sa for a Suffix Array or Prefix Array
+    
+    The bytes of a Node are the object, its attributes and its link list (sys.getsizeof), the strings and lists that
+    are shared with the caller are not counted, so the result is an estimate.
+    
+    Time Complexity: O(T) where T is the number of Nodes
+    Space Complexity: O(D) where D is the depth of the structure
+    """
+    
+    if isinstance(structure, Array_Trie):
+        arrays = (structure.link, structure.frequency, structure.word, structure.word_start, structure.word_blob)
+        return len(structure.word), sum(len(values) * memoryview(values).itemsize for values in arrays)
+    if isinstance(structure, (Suffix_Array, Prefix_Array)):
+        arrays = (structure.sa, structure.lcp)
+        text = structure.text.data if isinstance(structure.text, Packed_Genome) else structure.text
+        return len(structure.sa), sum(len(values) * memoryview(values).itemsize for values in arrays) + len(text)
+    
+    nodes = 0
+    size = 0
+    stack = [structure.root]
+    while stack:
+        current = stack.pop()
+        nodes += 1
+        size += sys.getsizeof(current) + sys.getsizeof(current.__dict__) + sys.getsizeof(current.link)
+        stack.extend(child for child in current.link if child is not None)
+    return nodes, size
+
+# a value that is never stored, so a cached None can be told apart from a miss
+_MISSING = object()
+
+class LRU_Cache:
+    
+    """
+    This class keeps the results of the most recent queries of a SequenceDatabase or OrfFinder, up to max_entries results
+    or max_bytes bytes. When it is full the least recently used result is evicted.
+    Each SequenceDatabase or OrfFinder needs its own LRU_Cache, the keys are the queries.
+    
+    entries: an OrderedDict of key to (value, bytes), the least recently used first
+    bytes: the estimated size of the keys and values in the cache (sys.getsizeof of the key, the value and its items)
+    hits, misses, evictions, invalidations: the number of times get found the key, didn't find it, a result was removed to
+                                            make room, and a result was removed because it was no longer correct
+    """
+    
+    def __init__(self, max_entries=None, max_bytes=None):
+        
+        """
+        Input: max_entries is the most results in the cache, max_bytes is the most bytes, at least one of them is needed
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        if max_entries is None and max_bytes is None:
+            raise ValueError("an LRU_Cache needs max_entries or max_bytes")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def get(self, key, default=None):
+        
+        """
+        Input: the key and the value to return if the key is not in the cache
+        Output: the value of the key, it becomes the most recently used
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def peek(self, key, default=None):
+        
+        """
+        Input: the key and the value to return if the key is not in the cache
+        Output: the value of the key, without counting a hit or a miss and without changing the order
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            entry = self.entries.get(key)
+            return default if entry is None else entry[0]
+    
+    def put(self, key, value):
+        
+        """
+        Input: the key and its value, a value larger than max_bytes is not kept
+        Output: add the value as the most recently used and evict the least recently used until the cache fits
+        
+        Time Complexity: O(V + E) where V is the number of items of the value and E is the number of evicted results
+        Space Complexity: O(1)
+        """
+        
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if isinstance(value, (tuple, list)):
+            size += sum(sys.getsizeof(item) for item in value)
+        
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self.entries[key] = (value, size)
+            self.bytes += size
+            while ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                   or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self.bytes -= self.entries.popitem(last=False)[1][1]
+                self.evictions += 1
+    
+    def discard(self, key):
+        
+        """
+        Input: a key
+        Output: remove the key from the cache if it is there, it is counted as an invalidation
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+                self.invalidations += 1
+    
+    def clear(self):
+        
+        """
+        Output: remove every result, they are counted as invalidations
+        
+        Time Complexity: O(N) where N is the number of results
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.bytes = 0
+    
+    def stats(self):
+        
+        """
+        Output: a dict with the hits, misses, evictions, invalidations, entries and bytes of the cache
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "invalidations": self.invalidations, "entries": len(self.entries), "bytes": self.bytes}
+    
+    def add_gauges(self, metrics, prefix):
+        
+        """
+        Input: a Metrics object and the prefix of the names, like "sequence_database_cache"
+        Output: add a gauge for each value of stats() to the metrics, all from one call of stats()
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        metrics.gauge(prefix, self.stats)
+
 # Question 1: DNA Fragments
 class Node:
     
@@ -5,16 +435,17 @@ class Node:
     This class is to create a Node for the Trie data structure.
     It have only 1 function that is the constructor of the class __init__.
     Each Node contains payload of link, frequency, word, and fakelink.
-    link: a list of size 5 where each index for each letter, index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D
+    link: a list of size 5 (or alphabet.size) where each index for each letter, index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D
     frequency: the total number of time the word added to the Trie
     word: the word which inserted into the Trie
     fakelink: a reference to a node 
+    top: a list of reference to the terminal Nodes with the highest frequency below the Node, only used when the Trie keeps the top k
     """
     
-    def __init__(self, frequency = None, word = None, fakelink=None, size=5):
+    def __init__(self, frequency = None, word = None, fakelink=None, size=5, top=None):
         
         """
-        Input: frequency, word, fakelink, size
+        Input: frequency, word, fakelink, size, top
         Output: a Node with all the input variable
         
         Time Complexity: O(1)
@@ -30,17 +461,22 @@ class Node:
         
         self.fakelink = fakelink
         
+        self.top = top
+        
 class Trie:
     
     """
     This class is to create a Trie data structure
-    This class have a total of 4 method, constructor, insert_recur, insert_recur_aux and search.
+    This class have a total of 8 method, constructor, insert_recur, insert_recur_aux, insert_iter, bulk_insert, search, search_best and top_k_search.
     Each Trie will have a root which is a Node. 
     """
     
-    def __init__(self):
+    def __init__(self, top_k=None, alphabet=ABCD):
         
         """
+        Input: top_k, if it is not None each Node keeps a list of the top_k words with the highest frequency below it,
+               alphabet is the Alphabet of the words, the link of each Node has alphabet.size entries
+        
         This constructor will create a variable root and assign it to a new Node
         
         Time Complexity: O(1) creating the Node()
@@ -48,7 +484,10 @@ class Trie:
         Auxiliary Space Complexity: O(1)
         """
         
-        self.root = Node()
+        self.top_k = top_k
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.root = Node(size=self.size, top=[] if top_k else None)
      
     def insert_recur(self, key):
         
@@ -59,8 +498,9 @@ class Trie:
         This function inserts a string into the Trie starting from the root. 
         This function calls insert_recur_aux to start the recursion. This will be explained below.
         The root will store the reference to the Node which has the word with the highest frequency. 
+        With top_k the top lists of the Nodes on the path of the key are updated with its terminal Node after the recursion.
         
-        Time Complexity: O(N) where N is the length of the key
+        Time Complexity: O(N) where N is the length of the key, O(N * K log K) with top_k where K is top_k
         Space Complexity: O(N) where N is the length of the key
         """
         
@@ -80,6 +520,13 @@ class Trie:
                 current.frequency = previous_node.frequency
                 current.fakelink = previous_node.fakelink
         
+        # the same path from the root, the terminal Node of the key is below its last Node
+        if self.top_k:
+            path = [current]
+            for index in self.alphabet.encode(key):
+                path.append(path[-1].link[index])
+            self._update_top(path, path[-1].link[0])
+        
     def insert_recur_aux(self, current, key, frequency=None, i=0):
         
         """
@@ -108,7 +555,7 @@ class Trie:
                 current.frequency += 1
             # if terminal node does not exist
             else:
-                current.link[index] = Node(frequency=1, word=key)
+                current.link[index] = Node(frequency=1, word=key, size=self.size)
                 current = current.link[index]
                 current.fakelink = current
             return(current)
@@ -116,7 +563,7 @@ class Trie:
         # recursive case
         else:
             # get the index
-            index = ord(key[i]) - 65 + 1
+            index = self.alphabet.index(key[i])
             
             # if path exist
             if current.link[index] is not None:
@@ -135,7 +582,7 @@ class Trie:
                 
             # if path doesnt exits
             else:
-                current.link[index] = Node()
+                current.link[index] = Node(size=self.size, top=[] if self.top_k else None)
                 current = current.link[index]
                 i+=1
                 previous_node = self.insert_recur_aux(current, key, frequency, i)
@@ -143,6 +590,139 @@ class Trie:
                     current.frequency = previous_node.frequency
                     current.fakelink = previous_node.fakelink
                 return(current)
+    
+    def insert_iter(self, key, count=1):
+        
+        """
+        Input: a single string of uppercase letters [A-D], count is the number of times the string is inserted
+        Output: Inserting the string into the Trie
+        
+        This function builds the same Trie as insert_recur without recursion, so a key of any length can be inserted.
+        It walks down from the root and keeps every Node on the way in a path list, then creates or updates the terminal Node.
+        After that it walks the path list backwards and gives each Node the terminal Node as its reference if the word now has
+        the highest frequency (or the same frequency and a smaller word). Once a Node keeps its reference, all the Nodes above it
+        also keep theirs, so the loop stops there.
+        
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(N) where N is the length of the key
+        """
+        
+        # walk down the key and keep the path
+        current = self.root
+        path = [current]
+        for index in self.alphabet.encode(key):
+            # if path doesnt exits
+            if current.link[index] is None:
+                current.link[index] = Node(size=self.size, top=[] if self.top_k else None)
+            current = current.link[index]
+            path.append(current)
+        
+        # terminal node
+        terminal = current.link[0]
+        if terminal is not None:
+            terminal.frequency += count
+        else:
+            terminal = Node(frequency=count, word=key, size=self.size)
+            terminal.fakelink = terminal
+            current.link[0] = terminal
+        
+        if self.top_k:
+            self._update_top(path, terminal)
+        self._update_path(path, terminal)
+    
+    def _update_path(self, path, terminal):
+        
+        """
+        Input: path is the list of Nodes from the root to the parent of terminal, terminal is the terminal Node of the word
+               that was just inserted
+        Output: update the frequency and referenced node of each Node on the path
+        
+        Time Complexity: O(N) where N is the length of the path
+        Space Complexity: O(1)
+        """
+        
+        # go back up the path and update the referenced node
+        for current in reversed(path):
+            if current.frequency is None or terminal.frequency > current.frequency:
+                current.frequency = terminal.frequency
+                current.fakelink = terminal
+            elif terminal.frequency == current.frequency and terminal.word < current.fakelink.word:
+                current.fakelink = terminal
+            else:
+                break
+    
+    def _update_top(self, path, terminal):
+        
+        """
+        Input: path is the list of Nodes from the root to the parent of terminal, terminal is the terminal Node of the word
+               that was just inserted
+        Output: update the top list of each Node on the path
+        
+        Only the frequency of this word changed, so the word is added to or moved up in each top list. If the word is not in
+        the top list of a Node, it is not in the top list of the Nodes above it either, so the loop stops there.
+        
+        Time Complexity: O(N * K log K) where N is the length of the path and K is top_k
+        Space Complexity: O(1)
+        """
+        
+        for current in reversed(path):
+            top = current.top
+            if terminal not in top:
+                if len(top) == self.top_k and _top_order(terminal) >= _top_order(top[-1]):
+                    break
+                top.append(terminal)
+            top.sort(key=_top_order)
+            del top[self.top_k:]
+    
+    def bulk_insert(self, items):
+        
+        """
+        Input: items, a list of (word, frequency) sorted by word with no repeated word
+        Output: Inserting every word into the Trie with its frequency
+        
+        If the Trie is empty, the Trie is built in one pass. The Nodes of the current word are kept in a stack, and the next
+        word only pops the Nodes below the common prefix with the previous word, so shared prefixes are walked once.
+        The Nodes after the common prefix are new and only have this word below them, so they are made with the word as their
+        reference and top list. The Nodes of the common prefix are updated from the bottom up like insert_iter, which stops
+        at the first Node that keeps its reference. The words come in sorted order, so for the same frequency the word
+        already referenced is the smaller one and only a higher frequency replaces it.
+        If the Trie is not empty, each word is inserted with insert_iter.
+        
+        Time Complexity: O(N) where N is the total length of the words, O(N * K log K) with top_k where K is top_k
+        Space Complexity: O(M) where M is the length of the longest word
+        """
+        
+        if self.root.frequency is not None:
+            for word, count in items:
+                self.insert_iter(word, count)
+            return
+        
+        size = self.size
+        top_k = self.top_k
+        stack = [self.root]
+        previous = ""
+        for word, count in items:
+            common = _common_length(word, 0, previous, 0, min(len(word), len(previous)))
+            del stack[common + 1:]
+            
+            # terminal node, made first so the new Nodes can reference it
+            terminal = Node(frequency=count, word=word, size=size)
+            terminal.fakelink = terminal
+            
+            # go back up the common prefix and update the referenced node
+            if top_k:
+                self._update_top(stack, terminal)
+            self._update_path(stack, terminal)
+            
+            # add the rest of the word
+            current = stack[-1]
+            for index in self.alphabet.encode(word[common:]):
+                child = Node(frequency=count, fakelink=terminal, size=size, top=[terminal] if top_k else None)
+                current.link[index] = child
+                current = child
+                stack.append(current)
+            current.link[0] = terminal
+            previous = word
             
     def search(self, key):
         
@@ -170,9 +750,7 @@ class Trie:
             return None
         
         #go through each letter of the key
-        for char in key:
-            # calculate index
-            index = ord(char) - 65 + 1
+        for index in self.alphabet.encode(key):
             # if path exist
             if current.link[index] is not None:
                 current = current.link[index]
@@ -181,391 +759,3450 @@ class Trie:
             else:
                 return None
         return(current.fakelink.word)
-
-class SequenceDatabase():
-    
-    """
-    This class creates a SequenceDatabase object. It have a total of 3 methods, constructor, addSequence and query.
-    Each object of SequenceDatabase will have a db variable which is a empty Trie.
-    addSeqeunce is to add a word into the db (database)
-    query will return the word in the database with the input parameter as prefix,
-    """
     
-    def __init__(self):
+    def search_best(self, key):
         
         """
-        This constructor creates a Trie object and assign it to the db variable. 
+        Input: a single string with only uppercase [A-D]
+        Output: (word, frequency) of the word search() returns, None if there's no such word
         
-        Time Complexity: O(1)
-        Space Complexity: O(1)
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
         """
         
-        self.db = Trie()
+        # begin from the root
+        current = self.root
+        for index in self.alphabet.encode(key):
+            current = current.link[index]
+            # if path doesnt exits
+            if current is None:
+                return None
+        if current.fakelink is None:
+            return None
+        return (current.fakelink.word, current.fakelink.frequency)
     
-    def addSequence(self, s):
+    def best_depth(self, key):
         
         """
-        Input: s, a string with only [A-D]
-        Output: insert s into the database
+        Input: a single string with only uppercase [A-D]
+        Output: the smallest j where search(key[:j]) is key, None if there's none (or key is not in the Trie)
         
-        This function will use the Trie method, insert_recur to insert the string into the database
+        Once a Node references the terminal Node of key, every Node below it on the path does too, so this walks down the
+        path once and then finds the first Node that references the terminal Node.
         
         Time Complexity: O(N) where N is the length of the string
         Space Complexity: O(N) where N is the length of the string
         """
         
-        self.db.insert_recur(s)
+        # begin from the root
+        current = self.root
+        path = [current]
+        for index in self.alphabet.encode(key):
+            current = current.link[index]
+            # if path doesnt exits
+            if current is None:
+                return None
+            path.append(current)
+        terminal = current.link[0]
+        if terminal is None:
+            return None
+        for j, current in enumerate(path):
+            if current.fakelink is terminal:
+                return j
+        return None
     
-    def query(self, q):
+    def top_k_search(self, key, k):
         
         """
-        Input: q, a string with only [A-D]
-        Output: the word of with q as the prefix and have the highest frequency in the database of words with q as prefix
+        Input: key, a string with only uppercase [A-D], k is the number of words
+        Output: a list of (word, frequency) of the k words with key as prefix with the highest frequency, sorted by highest
+                frequency then smallest word
         
-        This function calls the Trie method, search() to return the word with q as 
-        the prefix and have the highest frequency in the database of words with q as prefix.
+        If the Trie keeps the top list and k is at most top_k, the list of the Node of the key is used directly.
+        Otherwise every terminal Node below it is visited and the k best are chosen with a heap.
         
-        Time Complexity: O(N) where N is the length of the string
-        Space Complexity: O(N) where N is the length of the string 
+        Time Complexity: O(N + K) where N is the length of the key and K is k if the top list is used,
+                         O(N + S log K) where S is the number of Nodes below the key otherwise
+        Space Complexity: O(K) if the top list is used, O(S) otherwise
         """
         
-        return self.db.search(q)
-        
-
-# Question 2: Open reading frames
-class Suffix_Node:
-    
-    """
-    This class creates a Node for the Suffix Trie,
-    Each Node has a payload of link, start_index and start_fakelink
-    
-    link: a list of size 5 where each index for each letter, 
-          index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D  
-    start_index: the index of the first letter of the key
-    start_fakelink: a list of reference to the Node
-    
-    Time Complexity: O(1)
-    Space Complexity: O(N) where N is the size of the payload
-    Auxiliary Space Complexity: O(1)
-    """
+        # begin from the root
+        current = self.root
+        for index in self.alphabet.encode(key):
+            current = current.link[index]
+            # if path doesnt exits
+            if current is None:
+                return []
+        return self._top_k_below(current, k)
     
-    def __init__(self, word = None, start_fakelink=[], start_index = None, size=5):
-
-        self.link = [None] * size
+    def _top_k_below(self, current, k):
         
-        self.start_index = start_index
+        """
+        Input: current is the Node of the key, k is the number of words
+        Output: the list of top_k_search for the words below current
+        """
         
-        self.start_fakelink = start_fakelink
+        if self.top_k and k <= self.top_k:
+            return [(terminal.word, terminal.frequency) for terminal in current.top[:k]]
         
-class Suffix_Trie:
+        terminals = []
+        stack = [current]
+        while stack:
+            current = stack.pop()
+            for index, child in enumerate(current.link):
+                if child is None:
+                    continue
+                if index == 0:
+                    terminals.append(child)
+                else:
+                    stack.append(child)
+        return [(terminal.word, terminal.frequency) for terminal in heapq.nsmallest(k, terminals, key=_top_order)]
+
+class Concurrent_Trie(Trie):
     
     """
-    This class creates a Suffix Trie for a given string.
-    It contains 4 function constructor, suffix_insert_recur, suffix_insert_recur_aux and start_search
-    Each Suffix Trie will contain a root which is a Suffix Node.
+    This class creates a Trie that can be searched by many threads while other threads insert into it.
+    Inserting never changes a Node that a search can reach. The Nodes on the path of the word are copied (copy on write),
+    the copies are updated, and then the root is replaced by the copy of the root in a single assignment.
+    A search reads the root once, so it always sees the whole Trie before or after an insert, and doesn't need a lock.
+    Inserts are done one at a time with a lock.
     """
     
-    def __init__(self):
+    def __init__(self, top_k=None, alphabet=ABCD):
         
         """
-        This function creates a variable root and assign it to a new Suffix Node
+        Input: top_k and alphabet, the same as Trie
         
         Time Complexity: O(1)
         Space Complexity: O(1)
         """
         
-        self.root = Suffix_Node(start_fakelink=[])
-     
-    def suffix_insert_recur(self, key): 
-         
-        """
-        Input: a single non-empty string consisting only uppercase [A-D]
-        Output: insert the string to the Suffix Trie
-        
-        This function loops through the key/string from index 1 until the length of the list + 2.
-        For each iteration of the loop it will call suffix_insert_recur_aux to do the recursion. This will be explained below.
-        For each key, "#" will be added to the start of the list to indicate the start of the string.
-        For example, if a string "ABCD" is the parameter for the function then it will be modify to "#ABCD"
+        super().__init__(top_k, alphabet)
+        self._lock = threading.Lock()
+    
+    def insert_recur(self, key):
         
-        Time Complexity: O(N^2) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
+        """
+        The recursive insert changes the Nodes in place, so it is replaced by insert_iter.
         """
         
-        # add the character "#" to front of the key
-        key = "#" + key
-        
-        # loop from the start of the key
-        for start in range(1, len(key)):
-            current = self.root
-            self.suffix_insert_recur_aux(current, key=key, i = start, start_index = start)     
+        self.insert_iter(key)
     
-    def suffix_insert_recur_aux(self, current, key, i=0, start_index = 0):
+    def insert_iter(self, key, count=1):
         
         """
-        This function gets the each of the letter from the string using pointer i and check if there's Suffix Node for the letter, if there's no
-        Suffix Node for the letter than a new Suffix Node will be created and add all the appropriate payload for the Node. This function will
-        be called resursively until pointer i equals to the length of the key minus 1 which means it reach the end of the string.
+        Input: a single string of uppercase letters [A-D], count is the number of times the string is inserted
+        Output: Inserting the string into the Trie
         
-        Parameter: 
-        1. current: points to the current Suffix Node
-        2. key: the string/word
-        3. i: pointers for the string
-        4. start_index: the start index of the string/word
+        This function walks down the key like Trie.insert_iter, but each Node on the path is copied and linked from the copy
+        of its parent. The terminal Node is replaced by a new terminal Node with the new frequency, and the copies that
+        referenced the old terminal Node reference the new one. Then the copies are updated the same way as Trie.insert_iter
+        and the copy of the root is published.
         
-        Base Case: when i equals to length of the key minus 1, then it reach the end of string and create a terminal Node for it
-        Recursive Case: get the index of the letter and check if there's a existing path/Node for the letter, if there is, then current 
-                        will go to the existing Node and i + 1 and go to the next letter. If there's no path/Node existed, create a new Suffix Node
-                        and currrent then equals to the new Suffix Node and i + 1 and go to the next letter. After the recursion, the start_index of
-                        current node will be equals to the previous node start_index and will also append the last fakelink/reference that is added 
-                        to the previous node. 
-                        
-        Time Complexity: O(N) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(N) where N is the length of the key
         """
         
-        # base case
-        # check if i equals length of the key minus 1
-        # terminal node
-        if i == len(key)-1:
-            index = 0
-            current.link[index] = Suffix_Node(start_fakelink=[])
-            current = current.link[index]
-            current.start_index = start_index
-            current.start_fakelink.append(start_index)
-            return(current)
-
-        # recursive case
-        else:
-            # get the index of the current letter
-            index = ord(key[i]) - 65 + 1
+        with self._lock:
+            root = _copy_node(self.root)
             
-            # if path exist
-            if current.link[index] is not None:
-                current = current.link[index]
-                i+=1
-                previous_node = self.suffix_insert_recur_aux(current, key, i, start_index=start_index)
-                current.start_index = previous_node.start_index
-                current.start_fakelink.append(previous_node.start_fakelink[-1])
-                return(current)
-                
-            # if path doesnt exits
+            # walk down the key and copy the path
+            current = root
+            path = [current]
+            for index in self.alphabet.encode(key):
+                child = current.link[index]
+                # if path doesnt exits
+                if child is None:
+                    child = Node(size=self.size, top=[] if self.top_k else None)
+                else:
+                    child = _copy_node(child)
+                current.link[index] = child
+                current = child
+                path.append(current)
+            
+            # terminal node
+            old_terminal = current.link[0]
+            if old_terminal is not None:
+                terminal = Node(frequency=old_terminal.frequency + count, word=key, size=self.size)
             else:
-                current.link[index] = Suffix_Node(start_fakelink=[])
-                current = current.link[index]
-                i+=1
-                previous_node = self.suffix_insert_recur_aux(current, key, i, start_index=start_index)
-                current.start_index = previous_node.start_index
-                current.start_fakelink.append(previous_node.start_fakelink[-1])
-                return(current)
-     
-    def start_search(self, key):
+                terminal = Node(frequency=count, word=key, size=self.size)
+            terminal.fakelink = terminal
+            current.link[0] = terminal
+            
+            # the old terminal Node can only be referenced from the path
+            if old_terminal is not None:
+                for current in path:
+                    if current.fakelink is old_terminal:
+                        current.fakelink = terminal
+                    if current.top is not None:
+                        current.top = [terminal if top is old_terminal else top for top in current.top]
+            
+            if self.top_k:
+                self._update_top(path, terminal)
+            self._update_path(path, terminal)
+            
+            # publish the new version
+            self.root = root
+    
+    def bulk_insert(self, items):
         
         """
-        This function will search the key/string in the Suffix Trie and then it will return a list of all the start_index.
-        For example, start_search("A"), the function will return a list of index of the letter "A"
-        If there's no such string/key in the Suffix Trie then a empty list will be return.
+        Input: items, a list of (word, frequency) sorted by word with no repeated word
+        Output: Inserting every word into the Trie with its frequency
         
-        Time Complexity: O(N) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
-        Auxiliary Space Complexity: O(1)
+        If the Trie is empty, the words are inserted into a new Trie with Trie.bulk_insert and its root is published.
+        Otherwise each word is inserted with insert_iter.
+        
+        Time Complexity: O(N) where N is the total length of the words
+        Space Complexity: O(N) where N is the total length of the words
         """
         
-        # begin from the root
-        current = self.root
-        out = []
-        #go through the key 1 by 1
-        for char in key:
-            # calculate index
-            index = ord(char) - 65 + 1
-            # if path exist
-            if current.link[index] is not None:
-                current = current.link[index]
-                
-            # if path doesnt exits return empty list
-            else:
-                return out
-        return current.start_fakelink
+        with self._lock:
+            if self.root.frequency is None:
+                trie = Trie(top_k=self.top_k, alphabet=self.alphabet)
+                trie.bulk_insert(items)
+                self.root = trie.root
+                return
+        for word, count in items:
+            self.insert_iter(word, count)
+
+def _copy_node(node):
     
-class Prefix_Node:
-    def __init__(self, word = None, end_fakelink=[], end_index = None, size=5):
+    """
+    Input: a Node
+    Output: a new Node with the same payload, the link and top lists are copied so they can be changed
+    
+    Time Complexity: O(S + K) where S is the size of the link and K is the length of the top list
+    Space Complexity: O(S + K) where S is the size of the link and K is the length of the top list
+    """
+    
+    copy = Node(frequency=node.frequency, word=node.word, fakelink=node.fakelink, size=0,
+                top=list(node.top) if node.top is not None else None)
+    copy.link = list(node.link)
+    return copy
+
+def _top_order(terminal):
+    
+    """
+    Input: a terminal Node
+    Output: the key to sort terminal Nodes by highest frequency, then smallest word
+    """
+    
+    return (-terminal.frequency, terminal.word)
+
+def _common_length(a, i, b, j, limit):
+    
+    """
+    Input: a and b are strings or bytes, i and j are index into them, limit is the most letters to compare
+    Output: the length of the longest common prefix of a[i:] and b[j:], at most limit
+    
+    Pieces of doubling length are compared with one slice comparison each, and the piece is halved after a mismatch,
+    so a long match is compared in C instead of one letter at a time.
+    
+    Time Complexity: O(L) where L is the result
+    Space Complexity: O(L) where L is the result
+    """
+    
+    common = 0
+    step = 1
+    while common < limit:
+        step = min(step, limit - common)
+        if a[i + common:i + common + step] == b[j + common:j + common + step]:
+            common += step
+            step *= 2
+        elif step == 1:
+            break
+        else:
+            step //= 2
+    return common
+
+class Radix_Node(Node):
+    
+    """
+    This class creates a Node for the Radix Trie, it is a Node with an edge label.
+    The letters of the path from the parent to this Node are label[start:end], label is the inserted string the edge was
+    created from, so the letters are not copied.
+    
+    label: the string the letters of the edge come from
+    start: the index of the first letter of the edge in label
+    end: the index after the last letter of the edge in label
+    """
+    
+    def __init__(self, label=None, start=0, end=0, frequency=None, word=None, fakelink=None, size=5, top=None):
         
         """
-        This class creates a Node for the Prefix Trie,
-        Each Node has a payload of link, end_index and end_fakelink
-    
-        link: a list of size 5 where each index for each letter, 
-              index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D  
-        end_index: the index of the last letter of the key
-        end_fakelink: a list of reference to the Node
+        Input: label, start and end of the edge, then the same payload as Node
+        Output: a Radix Node
         
         Time Complexity: O(1)
         Space Complexity: O(N) where N is the size of the payload
-        Auxiliary Space Complexity: O(1)
         """
         
-        self.link = [None] * size
+        Node.__init__(self, frequency, word, fakelink, size, top)
         
-        self.end_index = end_index
+        self.label = label
         
-        self.end_fakelink = end_fakelink
+        self.start = start
         
-class Prefix_Trie:
+        self.end = end
+
+class Radix_Trie(Trie):
     
     """
-    This class creates a Prefix Trie for a given string.
-    It contains 4 function constructor, prefix_insert_recur, prefix_insert_recur_aux and end_search
-    Each Prefix Trie will contain a root which is a Prefix Node.
+    This class creates a Radix Trie (Patricia Trie), a Trie where every chain of Nodes with a single child is one Node
+    with an edge label. It has the same insert_recur, insert_iter, bulk_insert, search and top_k_search as the Trie and gives
+    the same results, but a Node is only created where words branch, so it has a lot fewer Nodes when the words are long and
+    don't share much. Each Node has the same frequency, reference and top list as the last Node of its chain in the Trie.
     """
     
-    def __init__(self):
+    def __init__(self, top_k=None, alphabet=ABCD):
         
         """
-        This function creates a variable root and assign it to a new Prefix Node
+        Input: top_k and alphabet, the same as the Trie
         
         Time Complexity: O(1)
         Space Complexity: O(1)
         """
         
-        self.root = Prefix_Node(end_fakelink=[])
-     
-    def prefix_insert_recur(self, key):  
+        Trie.__init__(self, top_k, alphabet)
+        self.root = Radix_Node(size=self.size, top=[] if top_k else None)
+    
+    def _child(self, current, key, codes, i):
         
         """
-        Input: a single non-empty string consisting only uppercase [A-D]
-        Output: insert the string to the Prefix Trie
+        Input: current is a Radix Node, key is the string and codes its index, i is the index of the next letter of key
+        Output: the child of current on the path of key[i:], its edge is a prefix of key[i:]
         
-        This function loops through the key/string from the last character in the string until the first letter of the string
-        For each iteration of the loop it will call prefix_insert_recur_aux to do the recursion. This will be explained below.
-        However, this function will insert the each prefix of the word from the last letter until the first letter, it's
-        not inserting the prefixes from the first letter to the last letter. That is why the loop starts from the last letter. 
-        For each key, "#" will be added to the start of the list to indicate the start of the string.
-        For example, if a string "ABCD" is the parameter for the function then it will be modify to "#ABCD"
+        If there is no child a new Node is created with the rest of the key as its edge. If the edge of the child only partly
+        matches key[i:], the edge is split: a new Node takes the matching letters and the child keeps the rest below it.
+        The new Node has the same words below it as the child, so it copies the child's reference and top list.
         
-        Time Complexity: O(N^2) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
+        Time Complexity: O(M) where M is the length of the edge
+        Space Complexity: O(1)
         """
         
-        # add the character "#" to the front of the key
-        key = "#" + key
+        index = codes[i]
+        child = current.link[index]
         
-        # loop from the back of the key/string
-        for start in range(len(key)-1, -1, -1):
-            current = self.root
-            self.prefix_insert_recur_aux(current, key=key, i = start, end_index = start)     
+        # if path doesnt exits
+        if child is None:
+            child = Radix_Node(key, i, len(key), size=self.size, top=[] if self.top_k else None)
+            current.link[index] = child
+            return child
+        
+        length = child.end - child.start
+        common = _common_length(key, i, child.label, child.start, min(length, len(key) - i))
+        # split the edge
+        if common < length:
+            middle = Radix_Node(child.label, child.start, child.start + common, frequency=child.frequency,
+                                fakelink=child.fakelink, size=self.size, top=list(child.top) if child.top is not None else None)
+            child.start += common
+            middle.link[self.alphabet.index(child.label[child.start])] = child
+            current.link[index] = middle
+            child = middle
+        return child
     
-    def prefix_insert_recur_aux(self, current, key, i=0, end_index = 0):
+    def _terminal(self, current, key, count):
         
         """
-        This function gets the each of the letter from the string using pointer i and check if there's Prefix Node for the letter, if there's no
-        Prefix Node for the letter than a new Prefix Node will be created and add all the appropriate payload for the Node. 
-        This function will be called resursively until pointer i equals to 0 which means it reach the first letter of the string.
-        
-        Parameter: 
-        1. current: points to the current Prefix Node
-        2. key: the string/word
-        3. i: pointers for the string
-        4. end_index: the end index of the string/word
-        
-        Base Case: when i equals to 0, then it reach the first letter of the string and create a terminal Node for it
-        Recursive Case: get the index of the letter and check if there's a existing path/Node for the letter, if there is, then current 
-                        will go to the existing Node and i + 1 and go to the next letter. If there's no path/Node existed, create a new Prefix Node
-                        and currrent then equals to the new Prefix Node and i + 1 and go to the next letter. After the recursion, the end_index of
-                        current node will be equals to the previous node end_index and will also append the last fakelink/reference that is added 
-                        to the previous node. 
-                        
-        Time Complexity: O(N) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
+        Input: current is the Radix Node where key ends, count is the number of times key is inserted
+        Output: the terminal Node of key, created or with its frequency increased
         """
         
-        # base case
-        # check if i equals 0
-        # terminal node
-        if i == 0:
-            index = 0
-            current.link[index] = Prefix_Node(end_fakelink=[])
-            current = current.link[index]
-            current.end_index = end_index
-            current.end_fakelink.append(end_index)
-            return(current)
-
-        # recursive case
+        terminal = current.link[0]
+        if terminal is not None:
+            terminal.frequency += count
         else:
-            index = ord(key[i]) - 65 + 1
-            
-            # if path exist
-            if current.link[index] is not None:
-                current = current.link[index]
-                i-=1
-                previous_node = self.prefix_insert_recur_aux(current, key, i, end_index=end_index)
-                current.end_index = previous_node.end_index
-                current.end_fakelink.append(previous_node.end_fakelink[-1])
-                return(current)
-                
-            # if path doesnt exits
-            else:
-                current.link[index] = Prefix_Node(end_fakelink=[])
-                current = current.link[index]
-                i-=1
-                previous_node = self.prefix_insert_recur_aux(current, key, i, end_index=end_index)
-                current.end_index = previous_node.end_index
-                current.end_fakelink.append(previous_node.end_fakelink[-1])
-                return(current)
-            
-    def end_search(self, key):
+            # a terminal Node has no children
+            terminal = Radix_Node(frequency=count, word=key, size=0)
+            terminal.fakelink = terminal
+            current.link[0] = terminal
+        return terminal
+    
+    def insert_recur(self, key):
         
         """
-        This function will search the key/string in the Prefix Trie starting from the last letter of the key till the first letter
-        and then it will return a list of all the end_index.
-        For example, end_search("ABC"), it will looop from C -> B -> A, and check if there's a existing path. If there is then go to the next letter.
-        If there's no such string/key in the Prefix Trie then a empty list will be return.
+        Input: a single string of uppercase letters [A-D]
+        Output: Inserting the string into the Radix Trie
         
-        Time Complexity: O(N) where N is the length of the key/string
-        Space Complexity: O(N) where N is the length of the key/string
+        This function calls insert_recur_aux on the root, it goes down one edge for each call.
+        
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(D) where D is the number of Nodes on the path of the key
         """
         
-        # begin from the root
-        current = self.root
-        out = []
-        #go through the key 1 by 1 from the back
-        for i in range(len(key)-1, -1,-1):
-            # calculate index
-            char = key[i]
-            index = ord(char) - 65 + 1
-            # if path exist
-            if current.link[index] is not None:
-                current = current.link[index]
-                
-            # if path doesnt exits
-            else:
-                return out
-            
-        return current.end_fakelink
-    
-class OrfFinder:
-    
-    """
-    This class have 2 methods, constructor and find(). 
-    The constructor of this class acceps a single non-empty string consisting of uppercase [A-D].
-    Then for each object of the class, it will have a Suffix Trie and Prefix Trie.
-    """
+        self.insert_recur_aux(self.root, key, self.alphabet.encode(key), 0)
     
-    def __init__(self, genome):
+    def insert_recur_aux(self, current, key, codes, i):
         
         """
-        Input: a single non-empty string consisting of uppercase [A-D]
+        Input: current points to the current Radix Node, key is the string and codes its index, i is the index of the next letter
+        Output: the terminal Node of key
         
-        This constructor will create a Suffix Trie and Prefix Trie and insert the string to both Suffix and Prefix Trie.
+        Base case: i equals to the length of the key, the terminal Node is created or its frequency increased
+        Recursive case: go to the child on the path of the key (splitting its edge if needed) and skip the letters of its edge,
+                        then after the recursion update the reference and top list of current with the terminal Node
         
-        Time Complexity: O(N^2) where N is the length of the string
-        Space Complexity: O(N) where N is the length of the string
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(D) where D is the number of Nodes on the path of the key
         """
         
-        self.genome = genome
-        self.suffix_trie = Suffix_Trie()
-        self.suffix_trie.suffix_insert_recur(genome)
-        self.prefix_tire = Prefix_Trie()
-        self.prefix_tire.prefix_insert_recur(genome)
- 
+        # base case
+        if i == len(key):
+            terminal = self._terminal(current, key, 1)
+        
+        # recursive case
+        else:
+            child = self._child(current, key, codes, i)
+            terminal = self.insert_recur_aux(child, key, codes, i + child.end - child.start)
+        
+        if self.top_k:
+            self._update_top([current], terminal)
+        self._update_path([current], terminal)
+        return terminal
+    
+    def insert_iter(self, key, count=1):
+        
+        """
+        Input: a single string of uppercase letters [A-D], count is the number of times the string is inserted
+        Output: Inserting the string into the Radix Trie
+        
+        This function walks down the edges of the key and keeps every Node on the way in a path list, then updates the
+        path the same way as the Trie.
+        
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(D) where D is the number of Nodes on the path of the key
+        """
+        
+        codes = self.alphabet.encode(key)
+        current = self.root
+        path = [current]
+        i = 0
+        while i < len(key):
+            current = self._child(current, key, codes, i)
+            i += current.end - current.start
+            path.append(current)
+        
+        terminal = self._terminal(current, key, count)
+        if self.top_k:
+            self._update_top(path, terminal)
+        self._update_path(path, terminal)
+    
+    def bulk_insert(self, items):
+        
+        """
+        Input: items, a list of (word, frequency)
+        Output: Inserting every word into the Radix Trie with its frequency
+        
+        Each word is inserted with insert_iter. The Radix Trie already walks a shared prefix as one edge.
+        
+        Time Complexity: O(N) where N is the total length of the words
+        Space Complexity: O(D) where D is the number of Nodes on the path of the longest word
+        """
+        
+        for word, count in items:
+            self.insert_iter(word, count)
+    
+    def items(self):
+        
+        """
+        Output: a list of (word, frequency) of every word in the Radix Trie, sorted by word
+        
+        Time Complexity: O(N log N) where N is the number of Nodes
+        Space Complexity: O(N) where N is the number of Nodes
+        """
+        
+        out = []
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            for index, child in enumerate(current.link):
+                if child is None:
+                    continue
+                if index == 0:
+                    out.append((child.word, child.frequency))
+                else:
+                    stack.append(child)
+        out.sort()
+        return out
+    
+    def _walk(self, key):
+        
+        """
+        Input: a string
+        Output: the Radix Node where the path of key ends (key can end in the middle of its edge), None if there's no path
+        """
+        
+        codes = self.alphabet.encode(key)
+        current = self.root
+        i = 0
+        while i < len(key):
+            current = current.link[codes[i]]
+            # if path doesnt exits
+            if current is None:
+                return None
+            length = min(current.end - current.start, len(key) - i)
+            if current.label[current.start:current.start + length] != key[i:i + length]:
+                return None
+            i += length
+        return current
+    
+    def search(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: the same word as Trie.search
+        
+        The key is compared with each edge in one slice comparison, so the loop runs once for each Node instead of each letter.
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        current = self._walk(key)
+        if current is None or current.fakelink is None:
+            return None
+        return current.fakelink.word
+    
+    def search_best(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: the same as Trie.search_best
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        current = self._walk(key)
+        if current is None or current.fakelink is None:
+            return None
+        return (current.fakelink.word, current.fakelink.frequency)
+    
+    def best_depth(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: the same as Trie.best_depth
+        
+        A prefix of key that ends inside an edge has the reference of the Node below the edge, so the first Node that
+        references the terminal Node of key gives the length of the path above it plus 1 (or 0 for the root).
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(D) where D is the number of Nodes on the path of the key
+        """
+        
+        current = self._walk(key)
+        # the key has to end at a Node, not inside an edge
+        if current is None or current.link[0] is None or current.link[0].word != key:
+            return None
+        terminal = current.link[0]
+        
+        if self.root.fakelink is terminal:
+            return 0
+        codes = self.alphabet.encode(key)
+        current = self.root
+        i = 0
+        while i < len(key):
+            current = current.link[codes[i]]
+            if current.fakelink is terminal:
+                return i + 1
+            i += current.end - current.start
+        return None
+    
+    def top_k_search(self, key, k):
+        
+        """
+        Input: key, a string with only uppercase [A-D], k is the number of words
+        Output: the same list as Trie.top_k_search
+        
+        Time Complexity: O(N + K) if the top list is used, O(N + S log K) where S is the number of Nodes below the key otherwise
+        Space Complexity: O(K) if the top list is used, O(S) otherwise
+        """
+        
+        current = self._walk(key)
+        if current is None:
+            return []
+        return self._top_k_below(current, k)
+
+class Array_Trie:
+    
+    """
+    This class creates a Trie that stores its Nodes in flat arrays instead of Node objects (struct of arrays).
+    It has the same insert_iter and search as the Trie and builds the same tree, but uses a lot less memory.
+    Each Node is an integer id, the root is 0.
+    
+    link: an array of size * number of Nodes, the children of Node i are link[i * size:(i + 1) * size],
+          index i = the i-th letter of the alphabet, 0 means there's no child,
+          index 0 = terminal, the word id + 1 of the word that ends at Node i, 0 if no word ends there, so a terminal
+          doesn't need a Node of its own
+    frequency: frequency[w] is the frequency of word id w, the frequency of Node i is frequency[word[i]]
+    word: word[i] is the id of the word Node i references (the highest frequency below it), -1 if none
+    word_start, word_blob: each word is stored once, word id w is word_blob[word_start[w]:word_start[w + 1]]
+    """
+    
+    def __init__(self, alphabet=ABCD):
+        
+        """
+        Input: alphabet is the Alphabet of the words, size is alphabet.size
+        
+        This constructor creates the arrays with only the root Node in it.
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = size = alphabet.size
+        self.link = array("i", bytes(4 * size))
+        self.frequency = array("q")
+        self.word = array("i", [-1])
+        self.word_start = array("q", [0])
+        self.word_blob = bytearray()
+        self._empty_link = array("i", bytes(4 * size))
+    
+    def new_node(self):
+        
+        """
+        Output: the id of a new Node with no children, terminal and word
+        
+        Time Complexity: O(1) amortized
+        Space Complexity: O(1)
+        """
+        
+        self.link.extend(self._empty_link)
+        self.word.append(-1)
+        return len(self.word) - 1
+    
+    def get_word(self, word_id):
+        
+        """
+        Input: the id of a word in the word pool
+        Output: the word as a string
+        
+        Time Complexity: O(N) where N is the length of the word
+        Space Complexity: O(N) where N is the length of the word
+        """
+        
+        return bytes(self.word_blob[self.word_start[word_id]:self.word_start[word_id + 1]]).decode("latin-1")
+    
+    def insert_iter(self, key, count=1):
+        
+        """
+        Input: a single string of uppercase letters [A-D], count is the number of times the string is inserted
+        Output: Inserting the string into the Trie
+        
+        This function works the same as Trie.insert_iter. It walks down the key and keeps the path, creates the word or adds
+        count to its frequency, then walks the path backwards and updates the word of each Node until a Node keeps its word.
+        A Node that already references the word sees the new frequency without a change.
+        Ties are broken by comparing the bytes of the words which is the same order as comparing the strings.
+        
+        Time Complexity: O(N) where N is the length of the key
+        Space Complexity: O(N) where N is the length of the key
+        """
+        
+        size = self.size
+        link = self.link
+        frequency = self.frequency
+        word = self.word
+        
+        # walk down the key and keep the path
+        current = 0
+        path = [current]
+        for index in self.alphabet.encode(key):
+            slot = current * size + index
+            # if path doesnt exits
+            if link[slot] == 0:
+                link[slot] = self.new_node()
+            current = link[slot]
+            path.append(current)
+        
+        # terminal, the word is added to the word pool the first time it is inserted
+        key_bytes = key.encode("latin-1")
+        terminal = link[current * size]
+        if terminal != 0:
+            best_word = terminal - 1
+            frequency[best_word] += count
+        else:
+            best_word = len(frequency)
+            link[current * size] = best_word + 1
+            frequency.append(count)
+            self.word_blob += key_bytes
+            self.word_start.append(len(self.word_blob))
+        
+        # go back up the path and update the referenced word
+        best_frequency = frequency[best_word]
+        word_start = self.word_start
+        for current in reversed(path):
+            other = word[current]
+            if other == best_word:
+                continue
+            if other == -1 or best_frequency > frequency[other]:
+                word[current] = best_word
+            elif best_frequency == frequency[other] and key_bytes < self.word_blob[word_start[other]:word_start[other + 1]]:
+                word[current] = best_word
+            else:
+                break
+    
+    def bulk_insert(self, items):
+        
+        """
+        Input: items, a list of (word, frequency) sorted by word with no repeated word
+        Output: Inserting every word into the Trie with its frequency
+        
+        This function works the same as Trie.bulk_insert. If the Trie is empty it is built in one pass with a stack of the
+        Nodes of the current word. The Nodes after the common prefix with the previous word are new and only have this word
+        below them, so they are added at once and reference it. The Nodes of the common prefix take the word if it has a
+        higher frequency, from the bottom up until a Node keeps its word (a tie keeps the smaller word that came before).
+        Otherwise each word is inserted with insert_iter.
+        
+        Time Complexity: O(N) where N is the total length of the words
+        Space Complexity: O(M) where M is the length of the longest word
+        """
+        
+        if self.word[0] != -1:
+            for word, count in items:
+                self.insert_iter(word, count)
+            return
+        
+        size = self.size
+        link = self.link
+        frequency = self.frequency
+        word_ids = self.word
+        
+        stack = [0]
+        previous = ""
+        for word, count in items:
+            common = _common_length(word, 0, previous, 0, min(len(word), len(previous)))
+            del stack[common + 1:]
+            
+            # the word is added to the word pool
+            word_id = len(frequency)
+            frequency.append(count)
+            self.word_blob += word.encode("latin-1")
+            self.word_start.append(len(self.word_blob))
+            
+            # go back up the common prefix and update the referenced word
+            for current in reversed(stack):
+                other = word_ids[current]
+                if other != -1 and frequency[other] >= count:
+                    break
+                word_ids[current] = word_id
+            
+            # add the rest of the word, all its Nodes at once
+            codes = self.alphabet.encode(word[common:])
+            first = len(word_ids)
+            link.frombytes(bytes(4 * size * len(codes)))
+            word_ids.extend(array("i", [word_id]) * len(codes))
+            current = stack[-1]
+            for child, index in enumerate(codes, first):
+                link[current * size + index] = child
+                current = child
+            stack.extend(range(first, first + len(codes)))
+            
+            # terminal
+            link[current * size] = word_id + 1
+            previous = word
+    
+    def search(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: the word of with key as the prefix and have the highest frequency in the database of words with key as prefix,
+                None if there's no such word
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        size = self.size
+        link = self.link
+        
+        # begin from the root
+        current = 0
+        for index in self.alphabet.encode(key):
+            current = link[current * size + index]
+            # if path doesnt exits
+            if current == 0:
+                return None
+        if self.word[current] == -1:
+            return None
+        return self.get_word(self.word[current])
+    
+    def search_best(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: (word, frequency) of the word search() returns, None if there's no such word
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        size = self.size
+        link = self.link
+        
+        # begin from the root
+        current = 0
+        for index in self.alphabet.encode(key):
+            current = link[current * size + index]
+            # if path doesnt exits
+            if current == 0:
+                return None
+        if self.word[current] == -1:
+            return None
+        return (self.get_word(self.word[current]), self.frequency[self.word[current]])
+    
+    def best_depth(self, key):
+        
+        """
+        Input: a single string with only uppercase [A-D]
+        Output: the same as Trie.best_depth, a Node references the word of key when its word id is the terminal of key
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        size = self.size
+        link = self.link
+        
+        # begin from the root
+        current = 0
+        path = [current]
+        for index in self.alphabet.encode(key):
+            current = link[current * size + index]
+            # if path doesnt exits
+            if current == 0:
+                return None
+            path.append(current)
+        terminal = link[current * size]
+        if terminal == 0:
+            return None
+        for j, current in enumerate(path):
+            if self.word[current] == terminal - 1:
+                return j
+        return None
+    
+    def top_k_search(self, key, k):
+        
+        """
+        Input: key, a string with only uppercase [A-D], k is the number of words
+        Output: a list of (word, frequency) of the k words with key as prefix with the highest frequency, sorted by highest
+                frequency then smallest word
+        
+        The Array_Trie doesn't keep top lists, so every Node below the key is visited and the k best of their words are chosen
+        with a heap.
+        
+        Time Complexity: O(N + S log K) where N is the length of the key, S is the number of Nodes below the key and K is k
+        Space Complexity: O(S) where S is the number of Nodes below the key
+        """
+        
+        size = self.size
+        link = self.link
+        
+        # begin from the root
+        current = 0
+        for index in self.alphabet.encode(key):
+            current = link[current * size + index]
+            # if path doesnt exits
+            if current == 0:
+                return []
+        
+        word_ids = []
+        stack = [current]
+        while stack:
+            current = stack.pop()
+            if link[current * size] != 0:
+                word_ids.append(link[current * size] - 1)
+            for index in range(1, size):
+                if link[current * size + index] != 0:
+                    stack.append(link[current * size + index])
+        
+        best = heapq.nsmallest(k, ((-self.frequency[word_id], self.get_word(word_id)) for word_id in word_ids))
+        return [(word, -frequency) for frequency, word in best]
+    
+    @classmethod
+    def from_trie(cls, trie):
+        
+        """
+        Input: a Trie
+        Output: an Array_Trie with the same Nodes, frequency and referenced words
+        
+        The Nodes are visited with a stack. Each Node gets an id and each terminal Node adds its word and frequency to the
+        word pool instead of getting a Node, then the reference of every Node is changed to the id of the word of its
+        referenced terminal Node.
+        
+        Time Complexity: O(N) where N is the number of Nodes
+        Space Complexity: O(N) where N is the number of Nodes
+        """
+        
+        out = cls(alphabet=trie.alphabet)
+        word_id = {}
+        visited = [(0, trie.root)]
+        stack = [(0, trie.root)]
+        while stack:
+            current, node = stack.pop()
+            # terminal node
+            terminal = node.link[0]
+            if terminal is not None:
+                word_id[id(terminal)] = len(out.frequency)
+                out.link[current * out.size] = len(out.frequency) + 1
+                out.frequency.append(terminal.frequency)
+                out.word_blob += terminal.word.encode("latin-1")
+                out.word_start.append(len(out.word_blob))
+            for index in range(1, out.size):
+                child = node.link[index]
+                if child is not None:
+                    child_id = out.new_node()
+                    out.link[current * out.size + index] = child_id
+                    visited.append((child_id, child))
+                    stack.append((child_id, child))
+        for current, node in visited:
+            if node.fakelink is not None:
+                out.word[current] = word_id[id(node.fakelink)]
+        return out
+    
+    def save(self, path):
+        
+        """
+        Input: path of the file
+        Output: write the Trie to the file so it can be opened with Mapped_Trie
+        
+        The file has the size of the link of a Node, the letters of the alphabet and the 5 arrays link, frequency, word,
+        word_start and word_blob. Version 3 keeps the terminals in link and the frequency of each word instead of each Node.
+        
+        Time Complexity: O(N) where N is the size of the arrays
+        Space Complexity: O(1)
+        """
+        
+        _write_index_file(path, _SEQUENCE_DATABASE_MAGIC, _SEQUENCE_DATABASE_VERSION,
+                          [array("q", [self.size]), self.alphabet.symbols.encode("latin-1"), self.link, self.frequency, self.word,
+                           self.word_start, self.word_blob])
+
+_SEQUENCE_DATABASE_MAGIC = b"SEQDB\x00\x00\x00"
+_SEQUENCE_DATABASE_VERSION = 3
+
+# magic, version, crc32 of everything after the header, number of sections
+_FILE_HEADER = struct.Struct("<8sIII")
+# offset and length in bytes of a section
+_FILE_SECTION = struct.Struct("<QQ")
+
+def _write_index_file(path, magic, version, sections):
+    
+    """
+    Input: path of the file, magic is 8 bytes that identifies the kind of file, version of the format,
+           sections is a list of arrays or bytes
+    Output: write the sections to the file
+    
+    The file starts with a header, then a table with the offset and length of each section, then the sections.
+    Each section starts at a multiple of 8 bytes so it can be used as an array directly from a memory map.
+    The header has a crc32 of the rest of the file so a truncated or damaged file can be detected.
+    
+    Time Complexity: O(N) where N is the total size of the sections
+    Space Complexity: O(N) where N is the total size of the sections
+    """
+    
+    if sys.byteorder != "little":
+        raise ValueError("index files can only be written on a little endian machine")
+    
+    offset = _FILE_HEADER.size + _FILE_SECTION.size * len(sections)
+    table = []
+    payload = []
+    for section in sections:
+        data = bytes(section)
+        padding = -offset % 8
+        payload.append(bytes(padding))
+        offset += padding
+        table.append(_FILE_SECTION.pack(offset, len(data)))
+        payload.append(data)
+        offset += len(data)
+    
+    body = b"".join(table) + b"".join(payload)
+    with open(path, "wb") as file:
+        file.write(_FILE_HEADER.pack(magic, version, zlib.crc32(body), len(sections)))
+        file.write(body)
+
+def _open_index_file(path, magic, version, verify=True):
+    
+    """
+    Input: path of the file, magic and version the file must have, verify is True to check the crc32
+    Output: the mmap of the file and a list of memoryview, one for each section
+    
+    A file with the wrong magic or version, a wrong checksum or a section outside of the file raises ValueError.
+    
+    Time Complexity: O(N) where N is the size of the file if verify is True, O(S) where S is the number of sections otherwise
+    Space Complexity: O(S) where S is the number of sections
+    """
+    
+    if sys.byteorder != "little":
+        raise ValueError("index files can only be opened on a little endian machine")
+    
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    view = memoryview(mapped)
+    sections = []
+    try:
+        if len(view) < _FILE_HEADER.size:
+            raise ValueError("%s is not an index file" % (path,))
+        file_magic, file_version, checksum, count = _FILE_HEADER.unpack_from(view)
+        if file_magic != magic:
+            raise ValueError("%s is not the right kind of index file" % (path,))
+        if file_version != version:
+            raise ValueError("%s has version %d, expected version %d" % (path, file_version, version))
+        if verify and zlib.crc32(view[_FILE_HEADER.size:]) != checksum:
+            raise ValueError("%s is damaged or truncated (checksum mismatch)" % (path,))
+        
+        for i in range(count):
+            position = _FILE_HEADER.size + _FILE_SECTION.size * i
+            if position + _FILE_SECTION.size > len(view):
+                raise ValueError("%s is truncated" % (path,))
+            offset, length = _FILE_SECTION.unpack_from(view, position)
+            if offset + length > len(view):
+                raise ValueError("%s is truncated" % (path,))
+            sections.append(view[offset:offset + length])
+    except ValueError:
+        for section in sections:
+            section.release()
+        view.release()
+        mapped.close()
+        raise
+    view.release()
+    return mapped, sections
+
+def _close_index_file(mapped, views):
+    
+    """
+    Input: the mmap of an index file and every memoryview made from it
+    Output: release the memoryview and close the mmap
+    
+    Time Complexity: O(S) where S is the number of memoryview
+    Space Complexity: O(1)
+    """
+    
+    for view in views:
+        view.release()
+    mapped.close()
+
+class Mapped_Trie(Array_Trie):
+    
+    """
+    This class opens a file written by Array_Trie.save and searches it directly from a memory map, the arrays are not read
+    into memory. Opening the file is almost instant and processes that open the same file share the page cache.
+    It is read only, insert_iter and bulk_insert raise TypeError.
+    """
+    
+    def __init__(self, path, verify=True):
+        
+        """
+        Input: path of the file, verify is True to check the checksum of the file
+        
+        Time Complexity: O(N) where N is the size of the file if verify is True, O(1) otherwise
+        Space Complexity: O(1)
+        """
+        
+        self.path = path
+        self._mapped, sections = _open_index_file(path, _SEQUENCE_DATABASE_MAGIC, _SEQUENCE_DATABASE_VERSION, verify)
+        meta, symbols, link, frequency, word, word_start, word_blob = sections
+        self._views = sections
+        self.alphabet = Alphabet(bytes(symbols).decode("latin-1"))
+        self.size = meta.cast("q")[0]
+        self.link = link.cast("i")
+        self.frequency = frequency.cast("q")
+        self.word = word.cast("i")
+        self.word_start = word_start.cast("q")
+        self.word_blob = word_blob
+    
+    def insert_iter(self, key, count=1):
+        raise TypeError("%s is opened read only" % (self.path,))
+    
+    def bulk_insert(self, items):
+        raise TypeError("%s is opened read only" % (self.path,))
+    
+    def close(self):
+        
+        """
+        This function releases the arrays and closes the memory map, the Trie can't be searched after that.
+        """
+        
+        _close_index_file(self._mapped, [self.link, self.frequency, self.word, self.word_start, *self._views])
+
+class SequenceDatabase():
+    
+    """
+    This class creates a SequenceDatabase object. It have a total of 7 methods, constructor, addSequence, bulk_load, query, query_top_k, save and open.
+    Each object of SequenceDatabase will have a db variable which is a empty Trie.
+    addSeqeunce is to add a word into the db (database)
+    query will return the word in the database with the input parameter as prefix,
+    """
+    
+    def __init__(self, storage="node", top_k=None, concurrent=False, alphabet=ABCD, metrics=None, cache=None):
+        
+        """
+        This constructor creates a Trie object and assign it to the db variable. 
+        With storage "array" the db is an Array_Trie instead, which keeps the Nodes in flat arrays and each word once,
+        addSequence and query work the same but the database uses about 8 times less memory.
+        With storage "radix" the db is a Radix_Trie, which only has a Node where the words branch.
+        With top_k each Node keeps its top_k words with the highest frequency, so query_top_k with k up to top_k doesn't
+        visit the Nodes below the prefix. This is only for storage "node" and "radix".
+        With concurrent the db is a Concurrent_Trie, so threads can call addSequence and bulk_load while other threads
+        call query, and each query sees the database before or after an insert, never in between. Only for storage "node".
+        alphabet is the Alphabet of the strings, for example DNA, IUPAC or PROTEIN, the default is the letters A-D.
+        metrics is a Metrics object that records the time of each insert and query, and the Nodes and bytes of the db.
+        cache is an LRU_Cache for the results of query, addSequence only removes the results whose word it changes.
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        if storage == "node":
+            self.db = Concurrent_Trie(top_k, alphabet) if concurrent else Trie(top_k, alphabet)
+        elif concurrent:
+            raise ValueError("concurrent can only be used with storage 'node'")
+        elif storage == "radix":
+            self.db = Radix_Trie(top_k, alphabet)
+        elif top_k:
+            raise ValueError("top_k can only be used with storage 'node' or 'radix'")
+        elif storage == "array":
+            self.db = Array_Trie(alphabet)
+        else:
+            raise ValueError("unknown storage %r" % (storage,))
+        
+        self.metrics = metrics
+        # _changes counts the inserts, the size of the db for the metrics is only computed again after one
+        self._changes = 0
+        self._size = None
+        if metrics is not None:
+            name = metrics.unique_name("sequence_database")
+            metrics.gauge(name, self._size_gauge)
+        
+        self.cache = cache
+        # _version counts the inserts, so a query doesn't cache a word that an insert changed during the search
+        self._version = 0
+        self._cache_lock = threading.Lock()
+        # the length of the longest query that was cached, longer prefixes of an inserted word can't be in the cache
+        self._cache_longest = 0
+        if cache is not None and metrics is not None:
+            cache.add_gauges(metrics, name + "_cache")
+    
+    def addSequence(self, s):
+        
+        """
+        Input: s, a string with only [A-D]
+        Output: insert s into the database
+        
+        This function will use the Trie method, insert_iter to insert the string into the database
+        
+        Time Complexity: O(N) where N is the length of the string, O(N + L^2) with a cache where L is the length of the
+                         longest cached query
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        if self.metrics is None:
+            self.db.insert_iter(s)
+        else:
+            begin = time.perf_counter()
+            self.db.insert_iter(s)
+            self.metrics.observe("sequence_database_insert_seconds", time.perf_counter() - begin)
+        self._changes += 1
+        if self.cache is not None:
+            self._invalidate(s)
+    
+    def _size_gauge(self):
+        
+        """
+        Output: a dict with the nodes and bytes of the db for the metrics, from one walk of the db that is kept until the
+                next insert
+        
+        Time Complexity: O(T) where T is the number of Nodes, O(1) if there was no insert since the last call
+        Space Complexity: O(D) where D is the depth of the db
+        """
+        
+        # read before the walk, an insert during the walk makes the next call walk again
+        changes = self._changes
+        if self._size is None or self._size[0] != changes:
+            self._size = (changes, _structure_size(self.db))
+        nodes, size = self._size[1]
+        return {"nodes": nodes, "bytes": size}
+    
+    def _invalidate(self, s):
+        
+        """
+        Input: s, the string that was just inserted
+        Output: remove the cached results of the prefixes of s whose word is now s
+        
+        Only the frequency of s changed, so the word of a prefix of s is either the same or s now, and the other queries
+        keep their word. If the word of a prefix is s, it is also s for every longer prefix, so one walk down the path of s
+        (best_depth) gives the shortest prefix whose word is s, and only that prefix and the longer ones are checked.
+        
+        Time Complexity: O(N + L^2) where N is the length of the string and L is the length of the longest cached query,
+                         for slicing the prefixes
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        cache = self.cache
+        with self._cache_lock:
+            self._version += 1
+            depth = self.db.best_depth(s)
+            # s is not the word of any prefix, so no word changed
+            if depth is None:
+                return
+            for j in range(depth, min(len(s), self._cache_longest) + 1):
+                key = s[:j]
+                if cache.peek(key, s) != s:
+                    cache.discard(key)
+    
+    def bulk_load(self, sequences):
+        
+        """
+        Input: sequences, an iterable of strings with only [A-D], sorted or not
+        Output: insert every string into the database
+        
+        This function gives the same database as calling addSequence for each string, but the repeated strings are counted
+        first and the distinct strings are sorted, then the Trie is built in one pass with bulk_insert. Each Node's reference
+        is computed once instead of once per string.
+        Most of the time of building Nodes is the garbage collector going through the Nodes that were already made, so it is
+        paused during the build (for the whole process, it is started again after). With distinct strings that is what makes
+        bulk_load faster than addSequence, with repeated strings counting them first also saves most of the walks.
+        
+        Time Complexity: O(N + D log D) where N is the total length of the strings and D is the number of distinct strings
+        Space Complexity: O(N) where N is the total length of the distinct strings
+        """
+        
+        begin = time.perf_counter() if self.metrics is not None else 0
+        items = sorted(Counter(sequences).items())
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.db.bulk_insert(items)
+        finally:
+            if enabled:
+                gc.enable()
+        self._changes += 1
+        if self.cache is not None:
+            # many words changed at once, so every result is removed
+            with self._cache_lock:
+                self._version += 1
+                self.cache.clear()
+        if self.metrics is not None:
+            self.metrics.observe("sequence_database_bulk_load_seconds", time.perf_counter() - begin)
+            self.metrics.count("sequence_database_bulk_load_sequences_total", len(items))
+    
+    def query(self, q):
+        
+        """
+        Input: q, a string with only [A-D]
+        Output: the word of with q as the prefix and have the highest frequency in the database of words with q as prefix
+        
+        This function calls the Trie method, search() to return the word with q as 
+        the prefix and have the highest frequency in the database of words with q as prefix.
+        With a cache the word is taken from the cache if it is there, otherwise it is searched and added to the cache.
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string 
+        """
+        
+        cache = self.cache
+        if cache is not None:
+            out = cache.get(q, _MISSING)
+            if out is not _MISSING:
+                return out
+            version = self._version
+        
+        if self.metrics is None:
+            out = self.db.search(q)
+        else:
+            begin = time.perf_counter()
+            out = self.db.search(q)
+            self.metrics.observe("sequence_database_query_seconds", time.perf_counter() - begin, q)
+        
+        if cache is not None:
+            with self._cache_lock:
+                # if there was an insert since the search began, the word may be old
+                if self._version == version:
+                    cache.put(q, out)
+                    self._cache_longest = max(self._cache_longest, len(q))
+        return out
+    
+    def query_top_k(self, q, k):
+        
+        """
+        Input: q, a string with only [A-D], k is the number of words
+        Output: a list of (word, frequency) of the k words in the database with q as the prefix with the highest frequency,
+                sorted by highest frequency then smallest word (the same order query() uses to choose one word)
+        
+        Time Complexity: O(N + K) where N is the length of the string if the database keeps top_k >= k,
+                         otherwise O(N + S log K) where S is the number of Nodes below the prefix
+        Space Complexity: O(K) or O(S)
+        """
+        
+        if self.metrics is None:
+            return self.db.top_k_search(q, k)
+        begin = time.perf_counter()
+        out = self.db.top_k_search(q, k)
+        self.metrics.observe("sequence_database_query_top_k_seconds", time.perf_counter() - begin, (q, k))
+        return out
+    
+    def save(self, path):
+        
+        """
+        Input: path of the file
+        Output: write the database to the file so it can be opened with SequenceDatabase.open
+        
+        A database with storage "node" or "radix" is changed to an Array_Trie first.
+        
+        Time Complexity: O(N) where N is the number of Nodes
+        Space Complexity: O(N) where N is the number of Nodes for storage "node", O(1) otherwise
+        """
+        
+        db = self.db
+        if isinstance(db, Radix_Trie):
+            db = Array_Trie(db.alphabet)
+            db.bulk_insert(self.db.items())
+        elif isinstance(db, Trie):
+            db = Array_Trie.from_trie(db)
+        db.save(path)
+    
+    @classmethod
+    def open(cls, path, verify=True, cache=None):
+        
+        """
+        Input: path of a file written by save, verify is True to check the checksum of the file, cache is an LRU_Cache
+        Output: a read only SequenceDatabase that queries the file through a memory map (Mapped_Trie), close() or a with
+                statement closes the memory map
+        
+        Time Complexity: O(N) where N is the size of the file if verify is True, O(1) otherwise
+        Space Complexity: O(1)
+        """
+        
+        database = cls(cache=cache)
+        database.db = Mapped_Trie(path, verify)
+        return database
+    
+    def close(self):
+        
+        """
+        This function closes the memory map of a SequenceDatabase from open(), query can't be used after that.
+        A database that isn't from open() has nothing to close.
+        """
+        
+        if isinstance(self.db, Mapped_Trie):
+            self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class Sharded_SequenceDatabase:
+    
+    """
+    This class splits a SequenceDatabase into shards, each shard is a SequenceDatabase in its own worker process.
+    A word belongs to the shard of its first prefix_length letters. The prefixes are given to the shards in sorted order,
+    so each shard owns one range of prefixes and all the words with the same prefix_length letters are in one shard.
+    addSequence puts the words in one batch for each shard and sends a batch when it has batch_size words, bulk_load sends
+    each shard its words at once, so the shards insert at the same time on different cores.
+    A query with at least prefix_length letters only goes to the shard that owns it. A shorter query goes to every shard
+    that owns a prefix starting with it, and the best word of the shards is chosen with the same rule as insert_recur,
+    the highest frequency and then the smallest word.
+    """
+    
+    def __init__(self, shards=None, prefix_length=None, storage="node", top_k=None, alphabet=ABCD, batch_size=1024, max_pending=None):
+        
+        """
+        Input: shards is the number of worker processes, None for the number of cores, less than 1 raises ValueError,
+               prefix_length is the number of letters that choose the shard of a word, None to have at least 4 prefixes for each shard,
+               storage, top_k and alphabet are the same as SequenceDatabase,
+               batch_size is the number of words addSequence sends to a shard at once,
+               max_pending is the most batches waiting for the shards, after that addSequence waits, None for 4 for each shard
+        
+        Time Complexity: O(S) where S is the number of shards, starting the worker processes
+        Space Complexity: O(S)
+        """
+        
+        if shards is None:
+            shards = os.cpu_count() or 1
+        elif shards < 1:
+            raise ValueError("shards must be at least 1, or None for the number of cores")
+        letters = alphabet.size - 1
+        if prefix_length is None:
+            prefix_length = 1
+            while letters ** prefix_length < 4 * shards and letters > 1:
+                prefix_length += 1
+        if prefix_length < 1 or letters ** prefix_length < shards:
+            raise ValueError("%d shards need at least as many prefixes of length %d" % (shards, prefix_length))
+        # check the other arguments here, an error in the worker processes would only break their pool
+        SequenceDatabase(storage, top_k, alphabet=alphabet)
+        
+        self.shards = shards
+        self.prefix_length = prefix_length
+        self.alphabet = alphabet
+        self.batch_size = batch_size
+        self.max_pending = 4 * shards if max_pending is None else max_pending
+        self._prefixes = letters ** prefix_length
+        self._pools = [ProcessPoolExecutor(max_workers=1, initializer=_shard_start, initargs=(storage, top_k, alphabet))
+                       for _ in range(shards)]
+        self._batches = [[] for _ in range(shards)]
+        self._pending = deque()
+    
+    def _shard_range(self, key):
+        
+        """
+        Input: a string with only letters of the alphabet
+        Output: (low, high), the shards low to high own every word with key as prefix, low == high if key has at least
+                prefix_length letters
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        codes = self.alphabet.encode(key)
+        last = self.alphabet.size - 2
+        low = high = 0
+        for j in range(self.prefix_length):
+            # a shorter key is filled with the first letter for the lowest prefix and the last letter for the highest
+            low = low * (last + 1) + (codes[j] - 1 if j < len(codes) else 0)
+            high = high * (last + 1) + (codes[j] - 1 if j < len(codes) else last)
+        return low * self.shards // self._prefixes, high * self.shards // self._prefixes
+    
+    def _submit(self, shard, function, *args):
+        
+        """
+        Input: the shard, a function of the worker process and its arguments
+        Output: the future of the job, the jobs of one shard run in the order they are submitted
+        """
+        
+        future = self._pools[shard].submit(function, *args)
+        self._pending.append(future)
+        # wait for the oldest jobs so the batches don't pile up, this also raises their errors
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft().result()
+        return future
+    
+    def addSequence(self, s):
+        
+        """
+        Input: s, a string with only letters of the alphabet
+        Output: add s to the batch of its shard, the batch is sent when it has batch_size words
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        shard = self._shard_range(s)[0]
+        batch = self._batches[shard]
+        batch.append(s)
+        if len(batch) >= self.batch_size:
+            self._batches[shard] = []
+            self._submit(shard, _shard_insert, batch)
+    
+    def flush(self):
+        
+        """
+        Output: send every batch and wait until the shards have inserted them, raise the error of any batch
+        
+        Time Complexity: O(W) where W is the total length of the words in the batches
+        Space Complexity: O(W)
+        """
+        
+        self._send_batches()
+        while self._pending:
+            self._pending.popleft().result()
+    
+    def _send_batches(self):
+        
+        """
+        Output: send every batch that isn't empty to its shard
+        """
+        
+        for shard, batch in enumerate(self._batches):
+            if batch:
+                self._batches[shard] = []
+                self._submit(shard, _shard_insert, batch)
+    
+    def bulk_load(self, sequences):
+        
+        """
+        Input: sequences, an iterable of strings with only letters of the alphabet
+        Output: insert every string into the database, each shard does SequenceDatabase.bulk_load with its own strings
+        
+        Time Complexity: O(N + D log D / S) where N is the total length of the strings, D is the number of distinct strings
+                         and S is the number of shards, the shards work at the same time
+        Space Complexity: O(N)
+        """
+        
+        parts = [[] for _ in range(self.shards)]
+        for s in sequences:
+            parts[self._shard_range(s)[0]].append(s)
+        self._send_batches()
+        for shard, part in enumerate(parts):
+            if part:
+                self._submit(shard, _shard_bulk_load, part)
+        self.flush()
+    
+    def query(self, q):
+        
+        """
+        Input: q, a string with only letters of the alphabet
+        Output: the same word as SequenceDatabase.query
+        
+        Time Complexity: O(N + S) where N is the length of the string and S is the number of shards that own q
+        Space Complexity: O(N + S)
+        """
+        
+        return self.query_many([q])[0]
+    
+    def query_many(self, queries):
+        
+        """
+        Input: queries, a list of strings with only letters of the alphabet
+        Output: a list of the word of query() for each string
+        
+        Each shard gets one job with all of its queries, so the queries cost one round trip to each shard.
+        
+        Time Complexity: O(N + Q * S) where N is the total length of the strings, Q is the number of strings and
+                         S is the number of shards
+        Space Complexity: O(N + Q * S)
+        """
+        
+        jobs = [[] for _ in range(self.shards)]
+        for i, q in enumerate(queries):
+            low, high = self._shard_range(q)
+            for shard in range(low, high + 1):
+                jobs[shard].append(i)
+        
+        self._send_batches()
+        futures = [(shard, self._submit(shard, _shard_search, [queries[i] for i in job]))
+                   for shard, job in enumerate(jobs) if job]
+        
+        best = [None] * len(queries)
+        for shard, future in futures:
+            for i, found in zip(jobs[shard], future.result()):
+                # highest frequency, then the smallest word
+                if found is not None and (best[i] is None or (-found[1], found[0]) < (-best[i][1], best[i][0])):
+                    best[i] = found
+        return [None if found is None else found[0] for found in best]
+    
+    def query_top_k(self, q, k):
+        
+        """
+        Input: q, a string with only letters of the alphabet, k is the number of words
+        Output: the same list as SequenceDatabase.query_top_k, the k best of each shard that owns q are merged
+        
+        Time Complexity: O(N + S * K log K) plus the time of query_top_k in the shards, where S is the number of shards that own q
+        Space Complexity: O(S * K)
+        """
+        
+        low, high = self._shard_range(q)
+        self._send_batches()
+        futures = [self._submit(shard, _shard_top_k, q, k) for shard in range(low, high + 1)]
+        return heapq.nsmallest(k, (item for future in futures for item in future.result()), key=lambda item: (-item[1], item[0]))
+    
+    def close(self):
+        
+        """
+        Output: send the batches, wait for the shards and stop the worker processes
+        """
+        
+        try:
+            self.flush()
+        finally:
+            for pool in self._pools:
+                pool.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+# the SequenceDatabase of a shard, one in each worker process of a Sharded_SequenceDatabase
+_shard_database = None
+
+def _shard_start(storage, top_k, alphabet):
+    
+    """
+    Input: the storage, top_k and alphabet of the Sharded_SequenceDatabase
+    Output: create the SequenceDatabase of this worker process
+    """
+    
+    global _shard_database
+    _shard_database = SequenceDatabase(storage, top_k, alphabet=alphabet)
+
+def _shard_insert(sequences):
+    
+    """
+    Input: a batch of strings
+    Output: addSequence each string into the SequenceDatabase of this worker process
+    """
+    
+    for s in sequences:
+        _shard_database.addSequence(s)
+
+def _shard_bulk_load(sequences):
+    
+    """
+    Input: a list of strings
+    Output: bulk_load the strings into the SequenceDatabase of this worker process
+    """
+    
+    _shard_database.bulk_load(sequences)
+
+def _shard_search(queries):
+    
+    """
+    Input: a list of queries
+    Output: a list of (word, frequency) or None for each query, from search_best of the SequenceDatabase of this worker process
+    """
+    
+    search_best = _shard_database.db.search_best
+    return [search_best(q) for q in queries]
+
+def _shard_top_k(q, k):
+    
+    """
+    Input: a query and the number of words
+    Output: query_top_k of the SequenceDatabase of this worker process
+    """
+    
+    return _shard_database.query_top_k(q, k)
+        
+
+# Question 2: Open reading frames
+class Suffix_Node:
+    
+    """
+    This class creates a Node for the Suffix Trie,
+    Each Node has a payload of link, start_index, lo and hi
+    
+    link: a list of size 5 (or alphabet.size) where each index for each letter, 
+          index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D  
+    start_index: the index of the first letter of the key
+    lo, hi: positions[lo:hi] of the Suffix Trie are the start_index of every suffix through this Node
+    
+    Time Complexity: O(1)
+    Space Complexity: O(N) where N is the size of the payload
+    Auxiliary Space Complexity: O(1)
+    """
+    
+    def __init__(self, word = None, start_index = None, size=5):
+
+        self.link = [None] * size
+        
+        self.start_index = start_index
+        
+        self.lo = self.hi = 0
+        
+class Suffix_Trie:
+    
+    """
+    This class creates a Suffix Trie for a given string.
+    It contains 5 function constructor, suffix_insert_recur, suffix_insert_recur_aux, suffix_insert_iter and start_search
+    Each Suffix Trie will contain a root which is a Suffix Node.
+    """
+    
+    def __init__(self, alphabet=ABCD, metrics=None):
+        
+        """
+        Input: alphabet is the Alphabet of the string, the link of each Suffix Node has alphabet.size entries,
+               metrics is a Metrics object that records the time of each insert and search, the number of start_index
+               returned, and the Nodes, bytes and positions of the Suffix Trie
+        
+        This function creates a variable root and assign it to a new Suffix Node
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.root = Suffix_Node(size=self.size)
+        self.positions = None
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.gauge(metrics.unique_name("suffix_trie"), self._size_gauge)
+    
+    def _size_gauge(self):
+        
+        """
+        Output: a dict with the nodes, bytes and positions of the Suffix Trie for the metrics, from one walk
+        
+        Time Complexity: O(T) where T is the number of Nodes
+        Space Complexity: O(D) where D is the depth of the Suffix Trie
+        """
+        
+        nodes, size = _structure_size(self)
+        return {"nodes": nodes, "bytes": size, "positions": len(self.positions) if self.positions is not None else 0}
+     
+    def suffix_insert_recur(self, key): 
+         
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Suffix Trie
+        
+        This function loops through the key/string from index 1 until the length of the list + 2.
+        For each iteration of the loop it will call suffix_insert_recur_aux to do the recursion. This will be explained below.
+        For each key, "#" will be added to the start of the list to indicate the start of the string.
+        For example, if a string "ABCD" is the parameter for the function then it will be modify to "#ABCD"
+        
+        Time Complexity: O(N^2) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.positions = None
+        begin = time.perf_counter() if self.metrics is not None else 0
+        # add the character "#" to front of the key
+        key = "#" + key
+        
+        # loop from the start of the key
+        for start in range(1, len(key)):
+            current = self.root
+            self.suffix_insert_recur_aux(current, key=key, i = start, start_index = start)
+        
+        if self.metrics is not None:
+            self.metrics.observe("suffix_trie_insert_seconds", time.perf_counter() - begin, len(key) - 1)     
+    
+    def suffix_insert_recur_aux(self, current, key, i=0, start_index = 0):
+        
+        """
+        This function gets the each of the letter from the string using pointer i and check if there's Suffix Node for the letter, if there's no
+        Suffix Node for the letter than a new Suffix Node will be created and add all the appropriate payload for the Node. This function will
+        be called resursively until pointer i equals to the length of the key minus 1 which means it reach the end of the string.
+        
+        Parameter: 
+        1. current: points to the current Suffix Node
+        2. key: the string/word
+        3. i: pointers for the string
+        4. start_index: the start index of the string/word
+        
+        Base Case: when i equals to length of the key minus 1, then it reach the end of string and create a terminal Node for it
+        Recursive Case: get the index of the letter and check if there's a existing path/Node for the letter, if there is, then current 
+                        will go to the existing Node and i + 1 and go to the next letter. If there's no path/Node existed, create a new Suffix Node
+                        and currrent then equals to the new Suffix Node and i + 1 and go to the next letter. After the recursion, the start_index of
+                        current node will be equals to the previous node start_index. 
+                        
+        Time Complexity: O(N) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        # base case
+        # check if i equals length of the key minus 1
+        # terminal node
+        if i == len(key)-1:
+            index = 0
+            current.link[index] = Suffix_Node(size=self.size)
+            current = current.link[index]
+            current.start_index = start_index
+            return(current)
+
+        # recursive case
+        else:
+            # get the index of the current letter
+            index = self.alphabet.index(key[i])
+            
+            # if path exist
+            if current.link[index] is not None:
+                current = current.link[index]
+                i+=1
+                previous_node = self.suffix_insert_recur_aux(current, key, i, start_index=start_index)
+                current.start_index = previous_node.start_index
+                return(current)
+                
+            # if path doesnt exits
+            else:
+                current.link[index] = Suffix_Node(size=self.size)
+                current = current.link[index]
+                i+=1
+                previous_node = self.suffix_insert_recur_aux(current, key, i, start_index=start_index)
+                current.start_index = previous_node.start_index
+                return(current)
+    
+    def suffix_insert_iter(self, key):
+        
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Suffix Trie
+        
+        This function builds the same Suffix Trie as suffix_insert_recur without recursion, so a string of any length can be inserted.
+        Every Node on the path of a suffix gets the same start_index, so instead of passing it back up after the recursion
+        the start_index is added to each Node while walking down the suffix.
+        The index of every letter is computed once before the loop since each letter is walked over by many suffixes.
+        
+        Time Complexity: O(N^2) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.positions = None
+        begin = time.perf_counter() if self.metrics is not None else 0
+        # add the character "#" to front of the key
+        key = "#" + key
+        last = len(key) - 1
+        indexes = b"\x00" + self.alphabet.encode(key[1:])
+        
+        # loop from the start of the key
+        for start in range(1, len(key)):
+            current = self.root
+            for i in range(start, last):
+                # get the index of the current letter
+                index = indexes[i]
+                # if path doesnt exits
+                if current.link[index] is None:
+                    current.link[index] = Suffix_Node(size=self.size)
+                current = current.link[index]
+                current.start_index = start
+            # terminal node
+            current.link[0] = Suffix_Node(start_index=start, size=self.size)
+        
+        if self.metrics is not None:
+            self.metrics.observe("suffix_trie_insert_seconds", time.perf_counter() - begin, len(key) - 1)
+     
+    def start_search(self, key):
+        
+        """
+        This function will search the key/string in the Suffix Trie and then it will return all the start_index.
+        For example, start_search("A"), the function will return the index of the letter "A"
+        If there's no such string/key in the Suffix Trie then a empty one will be return.
+        
+        The start_index are returned as a read only memoryview of the positions array, in the order of a depth first
+        walk of the Suffix Trie (the lexicographical order of the suffix), so nothing is copied and the caller can't change
+        the Suffix Trie. Use sorted() to get them in increasing order.
+        
+        Time Complexity: O(N) where N is the length of the key/string, plus O(T) the first time after an insert where T is the number of Nodes
+        Space Complexity: O(N) where N is the length of the key/string
+        Auxiliary Space Complexity: O(1)
+        """
+        
+        begin = time.perf_counter() if self.metrics is not None else 0
+        positions = self._positions()
+        # begin from the root
+        current = self.root
+        out = positions[0:0]
+        #go through the key 1 by 1
+        for index in self.alphabet.encode(key):
+            # if path exist
+            if current.link[index] is not None:
+                current = current.link[index]
+                
+            # if path doesnt exits return empty list
+            else:
+                break
+        else:
+            out = positions[current.lo:current.hi]
+        
+        if self.metrics is not None:
+            self.metrics.observe("suffix_trie_search_seconds", time.perf_counter() - begin, key)
+            self.metrics.observe("suffix_trie_positions_returned", len(out), key)
+        return out
+    
+    def _positions(self):
+        
+        """
+        Output: a read only memoryview of the start_index of every suffix in depth first order, built after each insert
+        """
+        
+        if self.positions is None:
+            self.positions = memoryview(_index_leaves(self.root, "start_index")).toreadonly()
+        return self.positions
+    
+class Prefix_Node:
+    def __init__(self, word = None, end_index = None, size=5):
+        
+        """
+        This class creates a Node for the Prefix Trie,
+        Each Node has a payload of link, end_index, lo and hi
+    
+        link: a list of size 5 (or alphabet.size) where each index for each letter, 
+              index 0 = terminal, index 1 = A, index 2 = B, index 3 = C, index 4 = D  
+        end_index: the index of the last letter of the key
+        lo, hi: positions[lo:hi] of the Prefix Trie are the end_index of every prefix through this Node
+        
+        Time Complexity: O(1)
+        Space Complexity: O(N) where N is the size of the payload
+        Auxiliary Space Complexity: O(1)
+        """
+        
+        self.link = [None] * size
+        
+        self.end_index = end_index
+        
+        self.lo = self.hi = 0
+        
+class Prefix_Trie:
+    
+    """
+    This class creates a Prefix Trie for a given string.
+    It contains 5 function constructor, prefix_insert_recur, prefix_insert_recur_aux, prefix_insert_iter and end_search
+    Each Prefix Trie will contain a root which is a Prefix Node.
+    """
+    
+    def __init__(self, alphabet=ABCD, metrics=None):
+        
+        """
+        Input: alphabet is the Alphabet of the string, the link of each Prefix Node has alphabet.size entries,
+               metrics is a Metrics object that records the time of each insert and search, the number of end_index
+               returned, and the Nodes, bytes and positions of the Prefix Trie
+        
+        This function creates a variable root and assign it to a new Prefix Node
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.root = Prefix_Node(size=self.size)
+        self.positions = None
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.gauge(metrics.unique_name("prefix_trie"), self._size_gauge)
+    
+    def _size_gauge(self):
+        
+        """
+        Output: a dict with the nodes, bytes and positions of the Prefix Trie for the metrics, from one walk
+        
+        Time Complexity: O(T) where T is the number of Nodes
+        Space Complexity: O(D) where D is the depth of the Prefix Trie
+        """
+        
+        nodes, size = _structure_size(self)
+        return {"nodes": nodes, "bytes": size, "positions": len(self.positions) if self.positions is not None else 0}
+     
+    def prefix_insert_recur(self, key):  
+        
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Prefix Trie
+        
+        This function loops through the key/string from the last character in the string until the first letter of the string
+        For each iteration of the loop it will call prefix_insert_recur_aux to do the recursion. This will be explained below.
+        However, this function will insert the each prefix of the word from the last letter until the first letter, it's
+        not inserting the prefixes from the first letter to the last letter. That is why the loop starts from the last letter. 
+        For each key, "#" will be added to the start of the list to indicate the start of the string.
+        For example, if a string "ABCD" is the parameter for the function then it will be modify to "#ABCD"
+        
+        Time Complexity: O(N^2) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.positions = None
+        begin = time.perf_counter() if self.metrics is not None else 0
+        # add the character "#" to the front of the key
+        key = "#" + key
+        
+        # loop from the back of the key/string
+        for start in range(len(key)-1, -1, -1):
+            current = self.root
+            self.prefix_insert_recur_aux(current, key=key, i = start, end_index = start)
+        
+        if self.metrics is not None:
+            self.metrics.observe("prefix_trie_insert_seconds", time.perf_counter() - begin, len(key) - 1)     
+    
+    def prefix_insert_recur_aux(self, current, key, i=0, end_index = 0):
+        
+        """
+        This function gets the each of the letter from the string using pointer i and check if there's Prefix Node for the letter, if there's no
+        Prefix Node for the letter than a new Prefix Node will be created and add all the appropriate payload for the Node. 
+        This function will be called resursively until pointer i equals to 0 which means it reach the first letter of the string.
+        
+        Parameter: 
+        1. current: points to the current Prefix Node
+        2. key: the string/word
+        3. i: pointers for the string
+        4. end_index: the end index of the string/word
+        
+        Base Case: when i equals to 0, then it reach the first letter of the string and create a terminal Node for it
+        Recursive Case: get the index of the letter and check if there's a existing path/Node for the letter, if there is, then current 
+                        will go to the existing Node and i + 1 and go to the next letter. If there's no path/Node existed, create a new Prefix Node
+                        and currrent then equals to the new Prefix Node and i + 1 and go to the next letter. After the recursion, the end_index of
+                        current node will be equals to the previous node end_index. 
+                        
+        Time Complexity: O(N) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        # base case
+        # check if i equals 0
+        # terminal node
+        if i == 0:
+            index = 0
+            current.link[index] = Prefix_Node(size=self.size)
+            current = current.link[index]
+            current.end_index = end_index
+            return(current)
+
+        # recursive case
+        else:
+            index = self.alphabet.index(key[i])
+            
+            # if path exist
+            if current.link[index] is not None:
+                current = current.link[index]
+                i-=1
+                previous_node = self.prefix_insert_recur_aux(current, key, i, end_index=end_index)
+                current.end_index = previous_node.end_index
+                return(current)
+                
+            # if path doesnt exits
+            else:
+                current.link[index] = Prefix_Node(size=self.size)
+                current = current.link[index]
+                i-=1
+                previous_node = self.prefix_insert_recur_aux(current, key, i, end_index=end_index)
+                current.end_index = previous_node.end_index
+                return(current)
+    
+    def prefix_insert_iter(self, key):
+        
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Prefix Trie
+        
+        This function builds the same Prefix Trie as prefix_insert_recur without recursion, so a string of any length can be inserted.
+        Each prefix is walked from its last letter to the first letter and the end_index is added to each Node on the way down.
+        The index of every letter is computed once before the loop since each letter is walked over by many prefixes.
+        
+        Time Complexity: O(N^2) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.positions = None
+        begin = time.perf_counter() if self.metrics is not None else 0
+        # add the character "#" to the front of the key
+        key = "#" + key
+        indexes = b"\x00" + self.alphabet.encode(key[1:])
+        
+        # loop from the back of the key/string
+        for start in range(len(key)-1, -1, -1):
+            current = self.root
+            for i in range(start, 0, -1):
+                index = indexes[i]
+                # if path doesnt exits
+                if current.link[index] is None:
+                    current.link[index] = Prefix_Node(size=self.size)
+                current = current.link[index]
+                current.end_index = start
+            # terminal node
+            current.link[0] = Prefix_Node(end_index=start, size=self.size)
+        
+        if self.metrics is not None:
+            self.metrics.observe("prefix_trie_insert_seconds", time.perf_counter() - begin, len(key) - 1)
+            
+    def end_search(self, key):
+        
+        """
+        This function will search the key/string in the Prefix Trie starting from the last letter of the key till the first letter
+        and then it will return all the end_index.
+        For example, end_search("ABC"), it will looop from C -> B -> A, and check if there's a existing path. If there is then go to the next letter.
+        If there's no such string/key in the Prefix Trie then a empty one will be return.
+        
+        The end_index are returned as a read only memoryview of the positions array in depth first order, the same as start_search
+        of the Suffix Trie.
+        
+        Time Complexity: O(N) where N is the length of the key/string, plus O(T) the first time after an insert where T is the number of Nodes
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        begin = time.perf_counter() if self.metrics is not None else 0
+        positions = self._positions()
+        # begin from the root
+        current = self.root
+        out = positions[0:0]
+        #go through the key 1 by 1 from the back
+        indexes = self.alphabet.encode(key)
+        for i in range(len(key)-1, -1,-1):
+            index = indexes[i]
+            # if path exist
+            if current.link[index] is not None:
+                current = current.link[index]
+                
+            # if path doesnt exits
+            else:
+                break
+        else:
+            out = positions[current.lo:current.hi]
+        
+        if self.metrics is not None:
+            self.metrics.observe("prefix_trie_search_seconds", time.perf_counter() - begin, key)
+            self.metrics.observe("prefix_trie_positions_returned", len(out), key)
+        return out
+    
+    def _positions(self):
+        
+        """
+        Output: a read only memoryview of the end_index of every prefix in depth first order, built after each insert
+        """
+        
+        if self.positions is None:
+            self.positions = memoryview(_index_leaves(self.root, "end_index")).toreadonly()
+        return self.positions
+    
+def _index_leaves(root, attribute):
+    
+    """
+    Input: root of a Suffix Trie or Prefix Trie (or their Radix version), attribute is "start_index" or "end_index"
+    Output: an array with the attribute of every terminal Node in depth first order, and every Node gets lo and hi so that
+            positions[lo:hi] are the terminal Nodes below it
+    
+    Each suffix (or prefix) is stored once instead of once in the list of each Node on its path, so the index uses O(T)
+    memory where T is the number of Nodes. The root is not on the path of any suffix, so its range stays empty.
+    
+    Time Complexity: O(T) where T is the number of Nodes
+    Space Complexity: O(T) where T is the number of Nodes
+    """
+    
+    positions = array("q")
+    stack = [(root, False)]
+    while stack:
+        current, done = stack.pop()
+        if done:
+            current.hi = len(positions)
+            continue
+        current.lo = len(positions)
+        link = current.link
+        # terminal node
+        if link[0] is not None:
+            positions.append(getattr(link[0], attribute))
+        stack.append((current, True))
+        for index in range(len(link) - 1, 0, -1):
+            if link[index] is not None:
+                stack.append((link[index], False))
+    root.lo = root.hi = 0
+    return positions
+
+class Radix_Suffix_Node:
+    
+    """
+    This class creates a Node for the Radix Suffix Trie and the Radix Prefix Trie.
+    It has the payload of a Suffix Node (or a Prefix Node) and an edge label, the letters of the edge are label[start:end]
+    where label is the index of every letter of the string, so the letters are not copied.
+    
+    link: a list of size alphabet.size, index 0 = terminal
+    label, start, end: the edge from the parent to this Node
+    start_index: the index of the first letter of the last suffix that went through this Node (the end_index for the Prefix Trie)
+    lo, hi: positions[lo:hi] of the trie are the start_index (or end_index) of every suffix through this Node
+    """
+    
+    def __init__(self, label=None, start=0, end=0, start_index=None, size=5):
+        
+        self.link = [None] * size
+        
+        self.label = label
+        
+        self.start = start
+        
+        self.end = end
+        
+        self.start_index = start_index
+        
+        self.lo = self.hi = 0
+
+def _radix_suffix_insert(root, text, start, stop, value, size):
+    
+    """
+    Input: root of a Radix Suffix Trie or Radix Prefix Trie, text is the index of every letter of the string,
+           start and stop are the letters of the suffix text[start:stop], value is the start_index (or end_index) to add,
+           size is the size of the link
+    Output: insert the suffix and set value as the start_index of every Node on its path, then add its terminal Node
+    
+    A missing child gets the rest of the suffix as its edge. An edge that only partly matches is split.
+    
+    Time Complexity: O(N) where N is the length of the suffix
+    Space Complexity: O(1)
+    """
+    
+    current = root
+    i = start
+    while i < stop:
+        index = text[i]
+        child = current.link[index]
+        # if path doesnt exits
+        if child is None:
+            child = Radix_Suffix_Node(text, i, stop, size=size)
+            current.link[index] = child
+        else:
+            length = child.end - child.start
+            common = _common_length(text, i, text, child.start, min(length, stop - i))
+            # split the edge
+            if common < length:
+                middle = Radix_Suffix_Node(text, child.start, child.start + common, child.start_index, size)
+                child.start += common
+                middle.link[text[child.start]] = child
+                current.link[index] = middle
+                child = middle
+        child.start_index = value
+        current = child
+        i += child.end - child.start
+    # terminal node, it has no children
+    current.link[0] = Radix_Suffix_Node(start_index=value, size=0)
+
+def _radix_walk(root, codes):
+    
+    """
+    Input: root of a Radix Suffix Trie or Radix Prefix Trie, codes is the index of every letter of the key
+    Output: the Node where the path of the key ends (the key can end in the middle of its edge), None if there's no path
+    """
+    
+    current = root
+    i = 0
+    while i < len(codes):
+        current = current.link[codes[i]]
+        # if path doesnt exits
+        if current is None:
+            return None
+        length = min(current.end - current.start, len(codes) - i)
+        if current.label[current.start:current.start + length] != codes[i:i + length]:
+            return None
+        i += length
+    return current
+
+class Radix_Suffix_Trie:
+    
+    """
+    This class creates a Radix Suffix Trie for a given string, a Suffix Trie where every chain of Nodes with a single child
+    is one Node with an edge label. start_search gives the same list as the Suffix Trie.
+    A Suffix Trie of N letters has O(N^2) Nodes, most of them on the single path at the end of each suffix, the Radix
+    Suffix Trie has at most 2N Nodes.
+    It contains 3 function constructor, suffix_insert_iter and start_search.
+    """
+    
+    def __init__(self, alphabet=ABCD):
+        
+        """
+        Input: alphabet is the Alphabet of the string
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.root = Radix_Suffix_Node(size=self.size)
+        self.positions = None
+    
+    def suffix_insert_iter(self, key):
+        
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Radix Suffix Trie
+        
+        Like the Suffix Trie, the suffix starting at each start_index is inserted without the last letter of the string.
+        The edges are labelled with the encoded string, each suffix only compares letters until it leaves the tree.
+        
+        Time Complexity: O(N^2) where N is the length of the key/string, O(N * D) where D is the average depth where the suffixes branch
+        Space Complexity: O(N) where N is the length of the key/string, at most 2N Nodes that each keep one start_index and a
+                          range lo:hi, the N start_index are only stored once in positions, built by the next start_search
+        """
+        
+        self.positions = None
+        text = self.alphabet.encode(key)
+        # the last letter is not inserted, the same as the Suffix Trie
+        stop = len(text) - 1
+        for start in range(1, len(text) + 1):
+            _radix_suffix_insert(self.root, text, start - 1, stop, start, self.size)
+    
+    def start_search(self, key):
+        
+        """
+        This function will search the key/string in the Radix Suffix Trie and then it will return all the start_index,
+        the same as the Suffix Trie (a read only memoryview in depth first order).
+        If there's no such string/key then a empty one will be return.
+        
+        Time Complexity: O(N) where N is the length of the key/string, plus O(T) the first time after an insert where T is the number of Nodes
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        positions = self._positions()
+        current = _radix_walk(self.root, self.alphabet.encode(key))
+        if current is None:
+            return positions[0:0]
+        return positions[current.lo:current.hi]
+    
+    def _positions(self):
+        
+        """
+        Output: a read only memoryview of the start_index of every suffix in depth first order, built after each insert
+        """
+        
+        if self.positions is None:
+            self.positions = memoryview(_index_leaves(self.root, "start_index")).toreadonly()
+        return self.positions
+
+class Radix_Prefix_Trie:
+    
+    """
+    This class creates a Radix Prefix Trie for a given string, a Prefix Trie where every chain of Nodes with a single child
+    is one Node with an edge label. end_search gives the same list as the Prefix Trie.
+    The prefixes are read from the last letter, so they are the suffixes of the reversed string and the edges are labelled
+    with the reversed string.
+    It contains 3 function constructor, prefix_insert_iter and end_search.
+    """
+    
+    def __init__(self, alphabet=ABCD):
+        
+        """
+        Input: alphabet is the Alphabet of the string
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.root = Radix_Suffix_Node(size=self.size)
+        self.positions = None
+    
+    def prefix_insert_iter(self, key):
+        
+        """
+        Input: a single non-empty string consisting only uppercase [A-D]
+        Output: insert the string to the Radix Prefix Trie
+        
+        The prefix ending at end_index is the suffix of the reversed string starting at len(key) - end_index.
+        
+        Time Complexity: O(N^2) where N is the length of the key/string, O(N * D) where D is the average depth where the prefixes branch
+        Space Complexity: O(N) where N is the length of the key/string, at most 2N Nodes that each keep one end_index and a
+                          range lo:hi, the N end_index are only stored once in positions, built by the next end_search
+        """
+        
+        self.positions = None
+        text = self.alphabet.encode(key)[::-1]
+        # loop from the back of the key/string, the same order as the Prefix Trie
+        for end in range(len(text), -1, -1):
+            _radix_suffix_insert(self.root, text, len(text) - end, len(text), end, self.size)
+    
+    def end_search(self, key):
+        
+        """
+        This function will search the key/string from its last letter in the Radix Prefix Trie and then it will return all
+        the end_index, the same as the Prefix Trie (a read only memoryview in depth first order).
+        If there's no such string/key then a empty one will be return.
+        
+        Time Complexity: O(N) where N is the length of the key/string, plus O(T) the first time after an insert where T is the number of Nodes
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        positions = self._positions()
+        current = _radix_walk(self.root, self.alphabet.encode(key)[::-1])
+        if current is None:
+            return positions[0:0]
+        return positions[current.lo:current.hi]
+    
+    def _positions(self):
+        
+        """
+        Output: a read only memoryview of the end_index of every prefix in depth first order, built after each insert
+        """
+        
+        if self.positions is None:
+            self.positions = memoryview(_index_leaves(self.root, "start_index")).toreadonly()
+        return self.positions
+
+# the index 1-4 of a letter as the base 4 digit "0"-"3"
+_PACK_DIGITS = bytes.maketrans(b"\x01\x02\x03\x04", b"0123")
+# a byte of 4 letters with the 4 letters in the opposite order
+_REVERSE_2BIT = bytes(((b & 3) << 6) | ((b >> 2 & 3) << 4) | ((b >> 4 & 3) << 2) | (b >> 6) for b in range(256))
+
+class Packed_Genome:
+    
+    """
+    This class stores a genome of an alphabet with at most 4 letters in 2 bits per letter, 4 letters in each byte with the
+    first letter in the highest 2 bits. It can be sliced like the genome string, only the letters that are sliced are decoded.
+    
+    A piece of the genome is read with kmer() as one int, and a key is packed the same way with pack(), so the Suffix Array
+    and Prefix Array compare a whole key with one int comparison instead of letter by letter.
+    
+    alphabet: the Alphabet of the genome
+    length: the number of letters
+    data: the packed bytes, (length + 3) // 4 of them
+    """
+    
+    def __init__(self, genome, alphabet=ABCD):
+        
+        """
+        Input: a string, alphabet is the Alphabet of the string, it can't have more than 4 letters
+        
+        The letters are translated to base 4 digits and the digits are read as one int, then the int is written as bytes.
+        
+        Time Complexity: O(N) where N is the length of the string
+        Space Complexity: O(N) where N is the length of the string, the result is N / 4 bytes
+        """
+        
+        if alphabet.size - 1 > 4:
+            raise ValueError("%r has more than 4 letters and can't be packed in 2 bits" % (alphabet,))
+        digits = alphabet.encode(genome).translate(_PACK_DIGITS)
+        # pad the last byte with the first letter
+        digits += b"0" * (-len(digits) % 4)
+        self.alphabet = alphabet
+        self.length = len(genome)
+        self.data = int(b"0" + digits, 4).to_bytes(len(digits) // 4, "big")
+        symbols = alphabet.symbols.ljust(4, alphabet.symbols[:1] or "?")
+        self._unpack = ["".join(symbols[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256)]
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                return self.decode(0, self.length)[index]
+            return self.decode(start, stop)
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("genome index out of range")
+        return self.alphabet.symbols[(self.data[index >> 2] >> (6 - 2 * (index & 3))) & 3]
+    
+    def __str__(self):
+        return self.decode(0, self.length)
+    
+    def decode(self, start, end):
+        
+        """
+        Input: start and end index (starting from 0, end not included)
+        Output: the letters from start to end as a string
+        
+        Each byte is decoded to its 4 letters with a table, then the extra letters of the first and last byte are cut.
+        
+        Time Complexity: O(end - start)
+        Space Complexity: O(end - start)
+        """
+        
+        if start >= end:
+            return ""
+        first = start >> 2
+        text = "".join(map(self._unpack.__getitem__, self.data[first:(end + 3) >> 2]))
+        return text[start - 4 * first:end - 4 * first]
+    
+    def pack(self, key):
+        
+        """
+        Input: a string of the letters of the alphabet
+        Output: the string packed as an int, 2 bits for each letter with the first letter in the highest bits
+        
+        Time Complexity: O(M) where M is the length of the key
+        Space Complexity: O(M) where M is the length of the key
+        """
+        
+        return int(b"0" + self.alphabet.encode(key).translate(_PACK_DIGITS), 4)
+    
+    def kmer(self, position, length):
+        
+        """
+        Input: position (starting from 0) and length
+        Output: the letters from position to position + length as an int, the same as pack() of those letters,
+                there are fewer letters if the genome ends before position + length
+        
+        Time Complexity: O(length)
+        Space Complexity: O(length)
+        """
+        
+        end = min(position + length, self.length)
+        first, last = position >> 2, (end + 3) >> 2
+        value = int.from_bytes(self.data[first:last], "big") >> (2 * (4 * last - end))
+        return value & ((1 << (2 * (end - position))) - 1)
+
+def _reverse_kmer(value, length):
+    
+    """
+    Input: a packed int of length letters
+    Output: the packed int of the letters in the opposite order
+    
+    The int is padded to whole bytes at the end, then the order of the bytes and of the letters in each byte is reversed,
+    the padding moves to the highest bits where it is 0.
+    """
+    
+    pad = -2 * length % 8
+    data = (value << pad).to_bytes((2 * length + pad) // 8, "big")
+    return int.from_bytes(data[::-1].translate(_REVERSE_2BIT), "big")
+
+def _packed_window(value, length, available):
+    
+    """
+    Input: value is a packed piece of the genome with available letters, length is the length of the key
+    Output: an int that compares with 2 * pack(key) the same way the piece of the genome compares with the key as a string
+    
+    A full piece is doubled. A shorter piece is padded with the lowest letter and doubled minus 1, so it is never equal to
+    a key, and it is smaller than the key exactly when its letters are not larger than the start of the key.
+    """
+    
+    if available == length:
+        return value << 1
+    return ((value << (2 * (length - available))) << 1) - 1
+
+def _suffix_window(genome, length):
+    
+    """
+    Input: a Packed_Genome and the length of the key
+    Output: a function that returns _packed_window of the length letters from a start_index (starting from 1)
+    
+    This is kmer() written out for the binary search, it is called once for each step.
+    """
+    
+    data = genome.data
+    size = genome.length
+    mask = (1 << (2 * length)) - 1
+    from_bytes = int.from_bytes
+    
+    def window(start):
+        position = start - 1
+        end = position + length
+        # the suffix is shorter than the key
+        if end > size:
+            return _packed_window(genome.kmer(position, length), length, size - position)
+        last = (end + 3) >> 2
+        return ((from_bytes(data[position >> 2:last], "big") >> (8 * last - 2 * end)) & mask) << 1
+    
+    return window
+
+def _prefix_window(genome, length):
+    
+    """
+    Input: a Packed_Genome and the length of the key
+    Output: a function that returns _packed_window of the length letters before an end_index, read from the last letter
+    """
+    
+    data = genome.data
+    mask = (1 << (2 * length)) - 1
+    pad = -2 * length % 8
+    size = (2 * length + pad) // 8
+    from_bytes = int.from_bytes
+    
+    def window(end):
+        # the prefix is shorter than the key
+        if end < length:
+            return _packed_window(_reverse_kmer(genome.kmer(0, end), end), length, end)
+        last = (end + 3) >> 2
+        value = (from_bytes(data[(end - length) >> 2:last], "big") >> (8 * last - 2 * end)) & mask
+        # _reverse_kmer written out
+        return from_bytes((value << pad).to_bytes(size, "big")[::-1].translate(_REVERSE_2BIT), "big") << 1
+    
+    return window
+
+class Suffix_Array:
+    
+    """
+    This class creates a Suffix Array for a given string, it is the linear time replacement for the Suffix Trie.
+    It contains 2 function constructor and start_search, so it can be used by OrfFinder in place of a Suffix Trie.
+    Each Suffix Array contains 3 variable, text, sa and lcp.
+    
+    text: the bytes of the string the Suffix Array is built from, or its Packed_Genome
+    sa: an array of the start_index (starting from 1, same as the Suffix Trie) of every suffix in lexicographical order
+    lcp: an array where lcp[i] is the length of the longest common prefix of the suffix at sa[i - 1] and sa[i], lcp[0] is 0
+    """
+    
+    def __init__(self, key, packed=None):
+        
+        """
+        Input: a single string, packed is the Packed_Genome of the string to keep instead of its bytes
+        Output: a Suffix Array of the string
+        
+        The suffix array is sorted with SA-IS and the lcp array is computed with Kasai's algorithm.
+        
+        Time Complexity: O(N) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.text = key.encode("latin-1")
+        sa = _sa_is(list(self.text), max(self.text, default=0))
+        self.lcp = _kasai(self.text, sa)
+        # shift the index so it starts from 1 like the start_index of the Suffix Trie
+        self.sa = array("q", [start + 1 for start in sa])
+        if packed is not None:
+            self.text = packed
+    
+    @classmethod
+    def from_arrays(cls, text, sa, lcp):
+        
+        """
+        Input: text, sa and lcp of a Suffix Array, they can be memoryview of a memory map
+        Output: a Suffix Array that uses them without copying
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        suffix_array = cls.__new__(cls)
+        suffix_array.text = text
+        suffix_array.sa = sa
+        suffix_array.lcp = lcp
+        return suffix_array
+    
+    def start_search(self, key):
+        
+        """
+        This function will search the key/string in the Suffix Array and then it will return all the start_index.
+        For example, start_search("A"), the function will return the index of the letter "A".
+        If there's no such string/key in the Suffix Array then a empty one will be return.
+        
+        The first suffix with key as prefix is found with binary search, then the lcp array is used to extend the
+        range until the suffix no longer have key as prefix. The range of sa is returned as a read only memoryview without
+        copying, in lexicographical order of the suffix like the Suffix Trie.
+        The Suffix Trie doesn't have the last letter of the string, so the key at the end of the string is not returned
+        either, it is the shortest suffix with key as prefix so it is always the first one in the range.
+        
+        Time Complexity: O(M log N + K) where M is the length of the key, N is the length of the text and K is the number of index
+        Space Complexity: O(M) where M is the length of the key
+        """
+        
+        text = self.text
+        if isinstance(text, Packed_Genome):
+            return self.start_search_packed(text.pack(key), len(key))
+        length = len(key)
+        low, high = _range_search(self.sa, self.lcp, key.encode("latin-1"), lambda start: bytes(text[start - 1:start - 1 + length]))
+        return self._without_last(low, high, length)
+    
+    def start_search_packed(self, value, length):
+        
+        """
+        Input: value is the key packed with Packed_Genome.pack, length is the length of the key
+        Output: the same as start_search(key)
+        
+        This needs a Suffix Array with a Packed_Genome. Each step of the binary search reads the first length letters of
+        a suffix as one int and compares it with the key, so no string is made.
+        
+        Time Complexity: O(M log N + K log K) where M is the length of the key, N is the length of the text and K is the number of index
+        Space Complexity: O(M + K) where M is the length of the key and K is the number of index
+        """
+        
+        low, high = _range_search(self.sa, self.lcp, value << 1, _suffix_window(self.text, length), length)
+        return self._without_last(low, high, length)
+    
+    def _without_last(self, low, high, length):
+        
+        """
+        Input: the range of sa from _range_search and the length of the key
+        Output: a read only memoryview of sa[low:high] without the suffix that is only the key and ends at the last letter
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        if low < high and self.sa[low] == len(self.sa) - length + 1:
+            low += 1
+        return memoryview(self.sa).toreadonly()[low:high]
+    
+class Prefix_Array:
+    
+    """
+    This class creates a Prefix Array for a given string, it is the linear time replacement for the Prefix Trie.
+    It is the Suffix Array of the reversed string, so each prefix of the string is sorted by reading it from the last letter.
+    It contains 2 function constructor and end_search, so it can be used by OrfFinder in place of a Prefix Trie.
+    Each Prefix Array contains 3 variable, text, sa and lcp.
+    
+    text: the bytes of the string the Prefix Array is built from (not reversed), or its Packed_Genome
+    sa: an array of the end_index (starting from 1, same as the Prefix Trie) of every prefix in lexicographical order of the reversed prefix
+    lcp: an array where lcp[i] is the length of the longest common suffix of the prefix at sa[i - 1] and sa[i], lcp[0] is 0
+    """
+    
+    def __init__(self, key, packed=None):
+        
+        """
+        Input: a single string, packed is the Packed_Genome of the string to keep instead of its bytes
+        Output: a Prefix Array of the string
+        
+        Time Complexity: O(N) where N is the length of the key/string
+        Space Complexity: O(N) where N is the length of the key/string
+        """
+        
+        self.text = key.encode("latin-1")
+        reverse = self.text[::-1]
+        sa = _sa_is(list(reverse), max(reverse, default=0))
+        self.lcp = _kasai(reverse, sa)
+        # the suffix of the reversed string starting at i is the prefix of the string ending at len(key) - i
+        self.sa = array("q", [len(key) - start for start in sa])
+        if packed is not None:
+            self.text = packed
+    
+    @classmethod
+    def from_arrays(cls, text, sa, lcp):
+        
+        """
+        Input: text, sa and lcp of a Prefix Array, they can be memoryview of a memory map
+        Output: a Prefix Array that uses them without copying
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        prefix_array = cls.__new__(cls)
+        prefix_array.text = text
+        prefix_array.sa = sa
+        prefix_array.lcp = lcp
+        return prefix_array
+    
+    def end_search(self, key):
+        
+        """
+        This function will search the key/string in the Prefix Array and then it will return all the end_index.
+        For example, end_search("ABC"), the function will return the index of the letter "C" of every "ABC".
+        If there's no such string/key in the Prefix Array then a empty one will be return.
+        The range of sa is returned as a read only memoryview without copying, the same as start_search of the Suffix Array.
+        
+        Time Complexity: O(M log N + K) where M is the length of the key, N is the length of the text and K is the number of index
+        Space Complexity: O(M) where M is the length of the key
+        """
+        
+        text = self.text
+        if isinstance(text, Packed_Genome):
+            return self.end_search_packed(text.pack(key), len(key))
+        length = len(key)
+        # the prefix ending at end, read from the last letter
+        low, high = _range_search(self.sa, self.lcp, key.encode("latin-1")[::-1], lambda end: bytes(text[max(0, end - length):end])[::-1])
+        return memoryview(self.sa).toreadonly()[low:high]
+    
+    def end_search_packed(self, value, length):
+        
+        """
+        Input: value is the key packed with Packed_Genome.pack, length is the length of the key
+        Output: the same as end_search(key)
+        
+        This needs a Prefix Array with a Packed_Genome. The prefixes are sorted from their last letter, so the key and
+        each piece of the genome are reversed as ints before they are compared.
+        
+        Time Complexity: O(M log N + K log K) where M is the length of the key, N is the length of the text and K is the number of index
+        Space Complexity: O(M + K) where M is the length of the key and K is the number of index
+        """
+        
+        low, high = _range_search(self.sa, self.lcp, _reverse_kmer(value, length) << 1, _prefix_window(self.text, length), length)
+        return memoryview(self.sa).toreadonly()[low:high]
+
+def _range_search(sa, lcp, key, window, length=None):
+    
+    """
+    Input: sa and lcp of a Suffix Array or Prefix Array, key is the string, window is a function that returns the first len(key)
+           letters of the suffix for an index in sa, length is the length of the key when key and window are packed int
+    Output: low and high where sa[low:high] are all the index with key as prefix
+    
+    Time Complexity: O(M log N + K) where M is the length of the key, N is the length of sa and K is high - low
+    Space Complexity: O(M) where M is the length of the key
+    """
+    
+    if length is None:
+        length = len(key)
+    # an empty key is not searched, the same as the root of the Suffix Trie and Prefix Trie
+    if length == 0:
+        return 0, 0
+    
+    # binary search for the first suffix that is not smaller than the key
+    low, high = 0, len(sa)
+    while low < high:
+        mid = (low + high) // 2
+        if window(sa[mid]) < key:
+            low = mid + 1
+        else:
+            high = mid
+    
+    # no suffix with key as prefix
+    if low == len(sa) or window(sa[low]) != key:
+        return low, low
+    
+    # every suffix after low that shares at least len(key) letters with the previous one also has key as prefix
+    high = low + 1
+    while high < len(sa) and lcp[high] >= length:
+        high += 1
+    return low, high
+
+def _sa_is(s, upper):
+    
+    """
+    Input: s, a list of integer from 0 to upper
+    Output: the suffix array of s, a list of the start of every suffix of s (starting from 0) in lexicographical order
+    
+    This function sorts the suffixes with the SA-IS algorithm (induced sorting). Each suffix is typed as S or L, the LMS suffixes
+    are sorted by inducing, renamed and then sorted by calling the function on the reduced string if the names are not unique.
+    The recursion is only on the reduced string which is at most half the length, so the depth is O(log N).
+    
+    Time Complexity: O(N + upper) where N is the length of s
+    Space Complexity: O(N + upper) where N is the length of s
+    """
+    
+    n = len(s)
+    if n == 0:
+        return []
+    if n == 1:
+        return [0]
+    if n == 2:
+        return [0, 1] if s[0] < s[1] else [1, 0]
+    
+    sa = [0] * n
+    # ls[i] is True if the suffix at i is S type (smaller than the next suffix)
+    ls = [False] * n
+    for i in range(n - 2, -1, -1):
+        ls[i] = ls[i + 1] if s[i] == s[i + 1] else s[i] < s[i + 1]
+    
+    # start of the S bucket and L bucket of each letter
+    sum_l = [0] * (upper + 1)
+    sum_s = [0] * (upper + 1)
+    for i in range(n):
+        if not ls[i]:
+            sum_s[s[i]] += 1
+        else:
+            sum_l[s[i] + 1] += 1
+    for i in range(upper + 1):
+        sum_s[i] += sum_l[i]
+        if i < upper:
+            sum_l[i + 1] += sum_s[i]
+    
+    def induce(lms):
+        for i in range(n):
+            sa[i] = -1
+        # put the LMS suffixes at the start of the S bucket
+        buf = sum_s[:]
+        for d in lms:
+            if d == n:
+                continue
+            sa[buf[s[d]]] = d
+            buf[s[d]] += 1
+        # induce the L type suffixes from left to right
+        buf = sum_l[:]
+        sa[buf[s[n - 1]]] = n - 1
+        buf[s[n - 1]] += 1
+        for i in range(n):
+            v = sa[i]
+            if v >= 1 and not ls[v - 1]:
+                sa[buf[s[v - 1]]] = v - 1
+                buf[s[v - 1]] += 1
+        # induce the S type suffixes from right to left
+        buf = sum_l[:]
+        for i in range(n - 1, -1, -1):
+            v = sa[i]
+            if v >= 1 and ls[v - 1]:
+                buf[s[v - 1] + 1] -= 1
+                sa[buf[s[v - 1] + 1]] = v - 1
+    
+    lms_map = [-1] * (n + 1)
+    lms = []
+    for i in range(1, n):
+        if not ls[i - 1] and ls[i]:
+            lms_map[i] = len(lms)
+            lms.append(i)
+    m = len(lms)
+    
+    induce(lms)
+    
+    if m:
+        # rename the sorted LMS substrings, equal substrings get the same name
+        sorted_lms = [v for v in sa if lms_map[v] != -1]
+        rec_s = [0] * m
+        rec_upper = 0
+        rec_s[lms_map[sorted_lms[0]]] = 0
+        for i in range(1, m):
+            left = sorted_lms[i - 1]
+            right = sorted_lms[i]
+            end_left = lms[lms_map[left] + 1] if lms_map[left] + 1 < m else n
+            end_right = lms[lms_map[right] + 1] if lms_map[right] + 1 < m else n
+            same = True
+            if end_left - left != end_right - right:
+                same = False
+            else:
+                while left < end_left:
+                    if s[left] != s[right]:
+                        break
+                    left += 1
+                    right += 1
+                if left == n or s[left] != s[right]:
+                    same = False
+            if not same:
+                rec_upper += 1
+            rec_s[lms_map[sorted_lms[i]]] = rec_upper
+        
+        # sort the LMS suffixes with the reduced string and induce the rest again
+        rec_sa = _sa_is(rec_s, rec_upper)
+        for i in range(m):
+            sorted_lms[i] = lms[rec_sa[i]]
+        induce(sorted_lms)
+    return sa
+
+def _kasai(s, sa):
+    
+    """
+    Input: s, a string or list, sa is the suffix array of s (starting from 0)
+    Output: the lcp array, lcp[i] is the length of the longest common prefix of the suffix at sa[i - 1] and sa[i], lcp[0] is 0
+    
+    This function uses Kasai's algorithm, the suffixes are visited in the order of the string, so the lcp of the next
+    suffix is at least the lcp of the current suffix minus 1.
+    
+    Time Complexity: O(N) where N is the length of s
+    Space Complexity: O(N) where N is the length of s
+    """
+    
+    n = len(s)
+    rank = [0] * n
+    for i in range(n):
+        rank[sa[i]] = i
+    lcp = array("q", bytes(8 * n))
+    h = 0
+    for i in range(n):
+        if h > 0:
+            h -= 1
+        if rank[i] == 0:
+            h = 0
+            continue
+        j = sa[rank[i] - 1]
+        while i + h < n and j + h < n and s[i + h] == s[j + h]:
+            h += 1
+        lcp[rank[i]] = h
+    return lcp
+    
+class Suffix_Tree_Node:
+    
+    """
+    This class creates a Node for the Suffix Tree.
+    
+    link: a list of size alphabet.size, link[i] is the child whose edge starts with the letter of index i (index 0 is not used)
+    start, end: the edge from the parent to this Node is text[start:end] of the Suffix Tree, end is None for a leaf,
+                the edge of a leaf goes to the end of the text and grows with it
+    suffix_link: for an internal Node with path xS, the Node with path S
+    start_index: for a leaf, the index of the first letter of its suffix (starting from 1)
+    """
+    
+    def __init__(self, start=0, end=None, start_index=None, size=5):
+        
+        self.link = [None] * size
+        
+        self.start = start
+        
+        self.end = end
+        
+        self.suffix_link = None
+        
+        self.start_index = start_index
+
+class Suffix_Tree:
+    
+    """
+    This class creates a Suffix Tree with Ukkonen's algorithm, so letters can be added to the end of the string at any time.
+    It has start_search like the Suffix Trie and end_search like the Prefix Trie, so one Suffix Tree is both indexes of an
+    OrfFinder: the string key ends at end_index exactly when it starts at end_index - len(key) + 1.
+    
+    The tree is kept implicit (there is no end marker), so the last remainder suffixes are not leaves yet, they end inside
+    the tree. The searches check those few suffixes directly.
+    
+    text: a bytearray of the letters of the string
+    root: the root Suffix Tree Node
+    active_node, active_edge, active_length: the point in the tree where the next letter is added
+    remainder: the number of suffixes that are not leaves yet
+    """
+    
+    def __init__(self, alphabet=ABCD):
+        
+        """
+        Input: alphabet is the Alphabet of the string
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.alphabet = alphabet
+        self.size = alphabet.size
+        self.text = bytearray()
+        self.root = Suffix_Tree_Node(end=0, size=self.size)
+        self.active_node = self.root
+        self.active_edge = 0
+        self.active_length = 0
+        self.remainder = 0
+    
+    def extend(self, key):
+        
+        """
+        Input: a string of the letters of the alphabet
+        Output: add the string to the end of the string of the Suffix Tree
+        
+        Each letter is added with Ukkonen's algorithm: every suffix that is not a leaf yet is extended by the letter, starting
+        from the active point. A suffix that already continues with the letter stops the loop (it and all the shorter ones
+        stay implicit), otherwise a leaf is added, splitting the edge if the active point is inside it. Suffix links move the
+        active point to the next shorter suffix without walking from the root.
+        
+        Time Complexity: O(M) amortized where M is the length of the key
+        Space Complexity: O(M) where M is the length of the key
+        """
+        
+        # check every letter before changing the tree
+        self.alphabet.encode(key)
+        table = self.alphabet.table
+        text = self.text
+        size = self.size
+        root = self.root
+        
+        for letter in key.encode("latin-1"):
+            text.append(letter)
+            position = len(text) - 1
+            self.remainder += 1
+            previous = None
+            while self.remainder > 0:
+                if self.active_length == 0:
+                    self.active_edge = position
+                index = table[text[self.active_edge]]
+                child = self.active_node.link[index]
+                
+                # no edge with this letter, add a leaf at the active Node
+                if child is None:
+                    self.active_node.link[index] = Suffix_Tree_Node(position, None, position - self.remainder + 2, size)
+                    if previous is not None:
+                        previous.suffix_link = self.active_node
+                        previous = None
+                else:
+                    end = child.end if child.end is not None else position + 1
+                    # walk down if the active point is past the end of the edge
+                    if self.active_length >= end - child.start:
+                        self.active_edge += end - child.start
+                        self.active_length -= end - child.start
+                        self.active_node = child
+                        continue
+                    
+                    # the suffix already continues with the letter, it stays implicit
+                    if text[child.start + self.active_length] == letter:
+                        if previous is not None:
+                            previous.suffix_link = self.active_node
+                        self.active_length += 1
+                        break
+                    
+                    # split the edge and add a leaf
+                    split = Suffix_Tree_Node(child.start, child.start + self.active_length, size=size)
+                    self.active_node.link[index] = split
+                    split.link[table[letter]] = Suffix_Tree_Node(position, None, position - self.remainder + 2, size)
+                    child.start += self.active_length
+                    split.link[table[text[child.start]]] = child
+                    if previous is not None:
+                        previous.suffix_link = split
+                    previous = split
+                
+                self.remainder -= 1
+                if self.active_node is root and self.active_length > 0:
+                    self.active_length -= 1
+                    self.active_edge = position - self.remainder + 1
+                elif self.active_node is not root:
+                    self.active_node = self.active_node.suffix_link or root
+    
+    def _occurrences(self, key):
+        
+        """
+        Input: a string
+        Output: a list of the index (starting from 1) of every place the key starts in the string
+        
+        The leaves below the place where the key ends in the tree are collected, then the suffixes that are not leaves yet
+        are checked with bytearray.find, they are all in the last remainder letters of the string.
+        
+        Time Complexity: O(M + K + R) where M is the length of the key, K is the number of index and R is the remainder
+        Space Complexity: O(K) where K is the number of index
+        """
+        
+        data = key.encode("latin-1")
+        self.alphabet.encode(key)
+        text = self.text
+        out = []
+        if len(data) == 0:
+            return out
+        
+        # walk down the key
+        current = self.root
+        i = 0
+        while i < len(data):
+            current = current.link[self.alphabet.table[data[i]]]
+            # if path doesnt exits
+            if current is None:
+                break
+            end = current.end if current.end is not None else len(text)
+            length = min(end - current.start, len(data) - i)
+            if text[current.start:current.start + length] != data[i:i + length]:
+                current = None
+                break
+            i += length
+        
+        # the leaves below
+        if current is not None:
+            stack = [current]
+            while stack:
+                current = stack.pop()
+                if current.end is None:
+                    out.append(current.start_index)
+                else:
+                    stack.extend(child for child in current.link if child is not None)
+        
+        # the suffixes that are not leaves yet
+        position = text.find(data, len(text) - self.remainder)
+        while position != -1:
+            out.append(position + 1)
+            position = text.find(data, position + 1)
+        return out
+    
+    def start_search(self, key):
+        
+        """
+        This function will search the key/string in the Suffix Tree and then it will return a new list of all the start_index,
+        in no particular order. Unlike the Suffix Trie a key that ends at the last letter of the string is also found.
+        
+        Time Complexity: O(M + K + R) where M is the length of the key, K is the number of index and R is the remainder
+        Space Complexity: O(K) where K is the number of index
+        """
+        
+        return self._occurrences(key)
+    
+    def end_search(self, key):
+        
+        """
+        This function will search the key/string in the Suffix Tree and then it will return a new list of all the end_index
+        (the index of the last letter of the key), in no particular order, the same index as the Prefix Trie.
+        
+        Time Complexity: O(M + K + R) where M is the length of the key, K is the number of index and R is the remainder
+        Space Complexity: O(K) where K is the number of index
+        """
+        
+        shift = len(key) - 1
+        return [start + shift for start in self._occurrences(key)]
+
+def _build_index(backend, kind, genome, alphabet=ABCD, packed=None, metrics=None):
+    
+    """
+    Input: backend is "trie", "radix", "suffix_array" or "suffix_tree", kind is "suffix" or "prefix", genome is the string,
+           alphabet is the Alphabet of the Suffix Trie or Prefix Trie, packed is the Packed_Genome for the Suffix Array or Prefix Array,
+           metrics is the Metrics of the Suffix Trie or Prefix Trie
+    Output: the suffix index or prefix index of the genome, a Suffix Tree is both
+    
+    The Suffix Trie and Prefix Trie record their inserts and searches in metrics but don't add their size gauges, the
+    OrfFinder already reports the size of its indexes.
+    
+    This is a module function so it can be run in a worker process.
+    
+    Time Complexity: O(N^2) where N is the length of the genome, O(N) for backend "suffix_array"
+    Space Complexity: O(N^2) where N is the length of the genome, O(N) for backend "suffix_array"
+    """
+    
+    if backend == "trie" and kind == "suffix":
+        index = Suffix_Trie(alphabet)
+        index.metrics = metrics
+        index.suffix_insert_iter(genome)
+    elif backend == "trie":
+        index = Prefix_Trie(alphabet)
+        index.metrics = metrics
+        index.prefix_insert_iter(genome)
+    elif backend == "radix" and kind == "suffix":
+        index = Radix_Suffix_Trie(alphabet)
+        index.suffix_insert_iter(genome)
+    elif backend == "radix":
+        index = Radix_Prefix_Trie(alphabet)
+        index.prefix_insert_iter(genome)
+    elif backend == "suffix_tree":
+        index = Suffix_Tree(alphabet)
+        index.extend(genome)
+    elif kind == "suffix":
+        index = Suffix_Array(genome, packed)
+    else:
+        index = Prefix_Array(genome, packed)
+    return index
+
+def _scan(genome, key):
+    
+    """
+    Input: genome and key are strings
+    Output: the sorted list of the start index (from 1, like start_search) of every place key is in the genome
+    
+    This is used by a lazy OrfFinder before its index is built, str.find skips through the genome without an index.
+    
+    Time Complexity: O(N + S) where N is the length of the genome and S is the number of index
+    Space Complexity: O(S) where S is the number of index
+    """
+    
+    out = []
+    if not key:
+        return out
+    i = genome.find(key)
+    while i != -1:
+        out.append(i + 1)
+        i = genome.find(key, i + 1)
+    return out
+
+_ORF_FINDER_MAGIC = b"ORFIDX\x00\x00"
+_ORF_FINDER_VERSION = 2
+
+class Mapped_Genome:
+    
+    """
+    This class wraps the bytes of a genome in a memory map (or the bytearray of a Suffix Tree) so it can be sliced like the
+    genome string. Only the letters that are sliced are copied and decoded.
+    """
+    
+    def __init__(self, view):
+        self.view = view
+    
+    def __len__(self):
+        return len(self.view)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return bytes(self.view[index]).decode("latin-1")
+        return chr(self.view[index])
+    
+    def __str__(self):
+        return bytes(self.view).decode("latin-1")
+
+class OrfFinder:
+    
+    """
+    This class have 10 methods, constructor, find(), find_iter(), find_many(), count(), extend(), genome_view(), save(), open() and close(). 
+    The constructor of this class acceps a single non-empty string consisting of uppercase [A-D].
+    Then for each object of the class, it will have a suffix index and a prefix index.
+    The index is either a Suffix Trie and Prefix Trie (backend "trie"), a Radix Suffix Trie and Radix Prefix Trie (backend "radix"),
+    a Suffix Array and Prefix Array (backend "suffix_array") or one Suffix Tree used as both (backend "suffix_tree").
+    """
+    
+    def __init__(self, genome, backend="trie", index=None, prefix_process=False, alphabet=ABCD, packed=False, metrics=None, cache=None, lazy=False):
+        
+        """
+        Input: a single non-empty string consisting of uppercase [A-D], backend is "trie", "radix", "suffix_array" or "suffix_tree",
+               index is a (suffix index, prefix index) pair that is already built, used by open(),
+               prefix_process is True to build the Prefix Array in a second process, only for backend "suffix_array",
+               alphabet is the Alphabet of the genome, for example DNA or IUPAC,
+               packed is True to keep the genome as a Packed_Genome, the alphabet can't have more than 4 letters,
+               metrics is a Metrics object that records the build time, the size of the index, the time of find and the
+               number of index the sweep of find looks at and of substrings (and the metrics of the Suffix Trie and Prefix Trie),
+               cache is an LRU_Cache for the results of find, it is cleared by extend(),
+               lazy is False to build both indexes now, True to build each index the first time it is used, or "background"
+               to build them in a background thread and answer find() by scanning the genome until they are built
+        
+        This constructor will create a Suffix Trie and Prefix Trie and insert the string to both Suffix and Prefix Trie.
+        With backend "suffix_array" it will create a Suffix Array and Prefix Array instead, find() returns the same result
+        but the index is built in linear time, so it can be used on a much longer genome.
+        With backend "radix" the tries only have a Node where the suffixes (or prefixes) branch.
+        With backend "suffix_tree" one Suffix Tree is built in linear time and is used as both indexes, it is the backend
+        that extend() updates without rebuilding.
+        With prefix_process, the Prefix Array is built in a worker process while this process builds the Suffix Array.
+        It is a split of the two arrays into two processes, it uses at most 2 cores and doesn't scale with more, SA-IS
+        itself is not split. The genome is sent to the worker and the arrays are sent back as flat bytes, and starting
+        the process takes a while, so it is only faster for a long genome on a machine with a free core.
+        This is not done for backend "trie", sending the Nodes back and creating them again costs more than building them.
+        With packed the genome uses 2 bits for each letter instead of a byte, the Suffix Array and Prefix Array share it and
+        search with packed keys, and the substrings are only decoded when find returns strings.
+        With lazy the constructor only checks the letters of the genome, so a program that never calls find (or only needs
+        one of the indexes) doesn't pay for building them. With lazy "background" a find() before the index is built scans the
+        genome with str.find, which is O(N) for each query but needs no index.
+        
+        Time Complexity: O(N^2) where N is the length of the string, O(N) for backend "suffix_array", O(N) with lazy
+        Space Complexity: O(N) where N is the length of the string
+        """
+        
+        if backend not in ("trie", "radix", "suffix_array", "suffix_tree"):
+            raise ValueError("unknown backend %r" % (backend,))
+        if packed and backend == "suffix_tree":
+            raise ValueError("packed can't be used with backend 'suffix_tree'")
+        if lazy not in (False, True, "background"):
+            raise ValueError("lazy must be False, True or 'background'")
+        if not isinstance(prefix_process, bool):
+            raise ValueError("prefix_process must be True or False")
+        if lazy and prefix_process:
+            raise ValueError("prefix_process can't be used with lazy")
+        
+        packed_genome = None
+        if packed and index is None:
+            # this also checks the letters
+            packed_genome = Packed_Genome(genome, alphabet)
+        elif index is None and (backend == "suffix_array" or lazy):
+            # the arrays work on the raw bytes, check the letters here so both backends reject the same genome
+            # (and a lazy OrfFinder rejects it now, not at its first find)
+            alphabet.encode(genome)
+        
+        self.genome = genome
+        self.backend = backend
+        self.alphabet = alphabet
+        self.metrics = metrics
+        self.cache = cache
+        self.lazy = lazy
+        self._mapped = None
+        self._genome_view = None
+        self._suffix_index = self._prefix_index = None
+        self._index_lock = threading.Lock()
+        self._builder = None
+        # _version counts the extends, so a find doesn't cache substrings of the genome before an extend
+        self._version = 0
+        self._cache_lock = threading.Lock()
+        self._size = None
+        begin = time.perf_counter() if metrics is not None else 0
+        if index is not None:
+            self.suffix_index, self.prefix_index = index
+        elif lazy:
+            # each index is built by _build_lazy the first time it is used
+            pass
+        elif backend == "suffix_tree":
+            if prefix_process:
+                raise ValueError("prefix_process can only be used with backend 'suffix_array'")
+            tree = Suffix_Tree(alphabet)
+            tree.extend(genome)
+            self.suffix_index = self.prefix_index = tree
+            # the genome grows with the text of the Suffix Tree
+            self.genome = Mapped_Genome(tree.text)
+        elif prefix_process:
+            if backend != "suffix_array":
+                raise ValueError("prefix_process can only be used with backend 'suffix_array'")
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                prefix_future = pool.submit(_build_index, backend, "prefix", genome, alphabet, packed_genome)
+                self.suffix_index = _build_index(backend, "suffix", genome, alphabet, packed_genome)
+                self.prefix_index = prefix_future.result()
+            if packed_genome is not None:
+                # the worker process sent back its own copy
+                self.prefix_index.text = packed_genome
+        else:
+            self.suffix_index = _build_index(backend, "suffix", genome, alphabet, packed_genome, metrics)
+            self.prefix_index = _build_index(backend, "prefix", genome, alphabet, packed_genome, metrics)
+        if packed_genome is not None:
+            self.genome = packed_genome
+        
+        if metrics is not None:
+            if index is None and not lazy:
+                metrics.observe("orf_finder_build_seconds", time.perf_counter() - begin, len(genome))
+            name = metrics.unique_name("orf_finder")
+            metrics.gauge(name, self._size_gauge)
+            if cache is not None:
+                cache.add_gauges(metrics, name + "_cache")
+        
+        if lazy == "background":
+            self._builder = threading.Thread(target=self._build_all, daemon=True)
+            self._builder.start()
+    
+    @property
+    def suffix_index(self):
+        
+        """
+        The Suffix Trie, Radix Suffix Trie, Suffix Array or Suffix Tree of the genome, it is built here if it is lazy and
+        wasn't built yet.
+        """
+        
+        index = self._suffix_index
+        if index is None:
+            index = self._build_lazy("suffix")
+        return index
+    
+    @suffix_index.setter
+    def suffix_index(self, index):
+        self._suffix_index = index
+    
+    @property
+    def prefix_index(self):
+        
+        """
+        The Prefix Trie, Radix Prefix Trie, Prefix Array or Suffix Tree of the genome, it is built here if it is lazy and
+        wasn't built yet.
+        """
+        
+        index = self._prefix_index
+        if index is None:
+            index = self._build_lazy("prefix")
+        return index
+    
+    @prefix_index.setter
+    def prefix_index(self, index):
+        self._prefix_index = index
+    
+    @property
+    def suffix_trie(self):
+        
+        """
+        The Suffix Trie of backend "trie", the same as suffix_index.
+        """
+        
+        if self.backend != "trie":
+            raise AttributeError("only backend 'trie' has a suffix_trie")
+        return self.suffix_index
+    
+    @property
+    def prefix_tire(self):
+        
+        """
+        The Prefix Trie of backend "trie", the same as prefix_index.
+        """
+        
+        if self.backend != "trie":
+            raise AttributeError("only backend 'trie' has a prefix_tire")
+        return self.prefix_index
+    
+    def _build_lazy(self, kind):
+        
+        """
+        Input: kind is "suffix" or "prefix"
+        Output: build the index of that kind if it isn't built yet and return it
+        
+        The lock makes a find() that needs the index wait for the background thread instead of building it a second time.
+        
+        Time Complexity: the time of building the index, O(1) if it is already built
+        Space Complexity: the size of the index
+        """
+        
+        with self._index_lock:
+            index = self._suffix_index if kind == "suffix" else self._prefix_index
+            if index is not None:
+                return index
+            begin = time.perf_counter() if self.metrics is not None else 0
+            if self.backend == "suffix_tree":
+                index = _build_index(self.backend, kind, self.genome, self.alphabet)
+                self._suffix_index = self._prefix_index = index
+                self.genome = Mapped_Genome(index.text)
+            else:
+                packed_genome = self.genome if isinstance(self.genome, Packed_Genome) else None
+                index = _build_index(self.backend, kind, str(self.genome), self.alphabet, packed_genome, self.metrics)
+                if kind == "suffix":
+                    self._suffix_index = index
+                else:
+                    self._prefix_index = index
+            if self.metrics is not None:
+                self.metrics.observe("orf_finder_lazy_build_seconds", time.perf_counter() - begin, kind)
+            return index
+    
+    def _size_gauge(self):
+        
+        """
+        Output: a dict with the genome_length and the nodes and bytes of the suffix index and prefix index for the metrics
+        
+        Each index is walked once, and again only after an extend or a lazy build. An index that isn't built yet has 0 Nodes,
+        exporting the metrics doesn't build it.
+        
+        Time Complexity: O(T) where T is the number of Nodes of the indexes, O(1) if nothing changed since the last call
+        Space Complexity: O(D) where D is the depth of the indexes
+        """
+        
+        suffix_index, prefix_index = self._suffix_index, self._prefix_index
+        key = (self._version, id(suffix_index), id(prefix_index))
+        if self._size is None or self._size[0] != key:
+            suffix_size = _structure_size(suffix_index) if suffix_index is not None else (0, 0)
+            # a Suffix Tree is both indexes
+            prefix_size = suffix_size if prefix_index is suffix_index else _structure_size(prefix_index) if prefix_index is not None else (0, 0)
+            self._size = (key, suffix_size + prefix_size)
+        suffix_nodes, suffix_bytes, prefix_nodes, prefix_bytes = self._size[1]
+        return {"genome_length": len(self.genome), "suffix_index_nodes": suffix_nodes, "suffix_index_bytes": suffix_bytes,
+                "prefix_index_nodes": prefix_nodes, "prefix_index_bytes": prefix_bytes}
+    
+    def _build_all(self):
+        
+        """
+        Output: build both indexes, this is run by the background thread of lazy "background"
+        """
+        
+        self._build_lazy("suffix")
+        self._build_lazy("prefix")
+    
+    def _positions(self, kind, key):
+        
+        """
+        Input: kind is "suffix" for the start index of key, "prefix" for the end index of key
+        Output: the sorted list of index from the suffix index or prefix index, or from scanning the genome if the
+                background thread hasn't built the index yet
+        
+        Time Complexity: O(len(key) + S log S) where S is the number of index, O(N) where N is the length of the genome
+                         when the genome is scanned
+        Space Complexity: O(S) where S is the number of index
+        """
+        
+        index = self._suffix_index if kind == "suffix" else self._prefix_index
+        if index is None and self._builder is not None and self._builder.is_alive():
+            if self.metrics is not None:
+                self.metrics.count("orf_finder_scans_total")
+            starts = _scan(str(self.genome), key)
+            return starts if kind == "suffix" else [start + len(key) - 1 for start in starts]
+        if kind == "suffix":
+            return sorted(self.suffix_index.start_search(key))
+        return sorted(self.prefix_index.end_search(key))
+ 
     def find(self, start, end):
         
         """
@@ -575,24 +4212,517 @@ class OrfFinder:
                 
         This function calls the start_search function in Suffix Trie to get all the indexes of the word with start as prefix
         And also the function calls end_seacrh function in Prefix Trie to get all the indexes of the word with end as suffix
-        Then loop the both start list and end list, if the index in end list minus the index in start list is smaller then the length 
-        of the start and end added together, that means there's overlap, else it will then slice the genome with the start index and
-        end index and add it into the out_list and return it
+        Then for each start index it slices the genome with every end index that is far enough after it so the start and end
+        don't overlap, and add it into the out_list and return it. This is done by find_iter.
+        With a cache the substrings are kept in the cache as a tuple, and a find of the same start and end returns a new
+        list of them without searching or slicing again.
         
-        Time Complexity: O(len(start) + len(end) + U) where U is the number of characters in the output list
+        Time Complexity: O(len(start) + len(end) + U) where U is the number of characters in the output list,
+                         O(K) for a cached result where K is the number of substrings
         Space Complexity: O(len(start + len(end))
         Auxiliary Space Complexity: O(U) where U is the number of characters in the output list
         """
         
-        start_list = self.suffix_trie.start_search(start)
-        end_list = self.prefix_tire.end_search(end)
-        least_sub_length = len(start + end)
+        cache = self.cache
+        if cache is not None:
+            out_list = cache.get((start, end))
+            if out_list is not None:
+                return list(out_list)
+            version = self._version
+        
+        if self.metrics is None:
+            out_list = list(self.find_iter(start, end))
+        else:
+            begin = time.perf_counter()
+            out_list = list(self.find_iter(start, end))
+            self.metrics.observe("orf_finder_find_seconds", time.perf_counter() - begin, (start, end))
+        
+        if cache is not None:
+            with self._cache_lock:
+                # if extend() ran during the find, the substrings may be from the shorter genome
+                if self._version == version:
+                    cache.put((start, end), tuple(out_list))
+        return out_list
+    
+    def find_iter(self, start, end, form="string"):
+        
+        """
+        Input: start and end are each a single non-empty string consisting of uppercase [A-D],
+               form is "string", "span" or "memoryview"
+        Output: a generator of the same substrings as find(), in the same order
+        
+        The substrings are yielded one at a time instead of being added to a list, so the caller can stream, count or
+        filter them without keeping all of them in memory. With form "span" a (start index, end index) pair is yielded
+        instead of the substring, genome[start - 1:end] is the substring. With form "memoryview" a memoryview of the bytes
+        of the genome is yielded, which does not copy the substring.
+        
+        Both lists of index are sorted, then a pointer into the end list moves forward as the start index increases, so each
+        start index goes directly to its first end index that doesn't overlap. Every end index after it is also valid, they are
+        yielded from the last one so the order is the same as looping the end list of the Prefix Trie.
+        
+        Time Complexity: O(len(start) + len(end) + S + E + K) where S and E are the number of start and end index and K is the
+                         number of substrings (plus sorting S and E if they are not sorted already)
+        Space Complexity: O(len(start) + len(end) + S + E)
+        """
+        
+        make = self._make(form)
+        start_list, end_list, least_distance = self._sorted_index(start, end)
+        if self.metrics is None:
+            yield from self._join(start_list, end_list, least_distance, make)
+            return
+        
+        self._record_candidates(start, end, start_list, end_list)
+        emitted = 0
+        for substring in self._join(start_list, end_list, least_distance, make):
+            emitted += 1
+            yield substring
+        self.metrics.count("orf_finder_pairs_emitted_total", emitted)
+    
+    def find_many(self, pairs, form="string"):
+        
+        """
+        Input: pairs, a list of (start, end), form is the same as find_iter
+        Output: a list with the result of find(start, end) for each pair, in the same order as pairs
+        
+        Each distinct start is searched in the suffix index once and each distinct end is searched in the prefix index once,
+        the sorted lists of index are kept and shared by every pair that uses the same start or end.
+        For example a codon table with 3 stop codons only searches the prefix index 3 times.
+        
+        Time Complexity: O(L + S + E + K) where L is the total length of the distinct start and end, S and E are the total number
+                         of index of the distinct start and end, and K is the total number of substrings
+        Space Complexity: O(L + S + E)
+        """
+        
+        pairs = list(pairs)
+        make = self._make(form)
+        
+        start_lists = {}
+        end_lists = {}
+        for start, end in pairs:
+            if start not in start_lists:
+                start_lists[start] = self._positions("suffix", start)
+            if end not in end_lists:
+                end_lists[end] = self._positions("prefix", end)
+        
         out_list = []
+        for start, end in pairs:
+            least_distance = max(len(start) + len(end) - 1, 1)
+            out_list.append(list(self._join(start_lists[start], end_lists[end], least_distance, make)))
+            if self.metrics is not None:
+                self._record_candidates(start, end, start_lists[start], end_lists[end])
+                self.metrics.count("orf_finder_pairs_emitted_total", len(out_list[-1]))
+        return out_list
+    
+    def count(self, start, end):
+        
+        """
+        Input: start and end are each a single non-empty string consisting of uppercase [A-D]
+        Output: the number of substrings find() would return
+        
+        This function moves the pointer into the end list the same way as find_iter, but adds the number of valid end index
+        for each start index instead of slicing the substrings.
+        
+        Time Complexity: O(len(start) + len(end) + S + E) where S and E are the number of start and end index
+        Space Complexity: O(len(start) + len(end) + S + E)
+        """
+        
+        start_list, end_list, least_distance = self._sorted_index(start, end)
+        
+        total = 0
+        first = 0
+        for start in start_list:
+            while first < len(end_list) and end_list[first] < start + least_distance:
+                first += 1
+            total += len(end_list) - first
+        return total
+    
+    def extend(self, more):
+        
+        """
+        Input: more, a string of the letters of the alphabet
+        Output: add more to the end of the genome, find() after this finds the substrings of the longer genome
+        
+        With backend "suffix_tree" the letters are added to the Suffix Tree with Ukkonen's algorithm, the work already done
+        is kept. The other backends build their index again from the whole genome, with lazy this is done the next time the
+        index is used (or by a new background thread). An OrfFinder from open() is read only.
+        The results in the cache are for the shorter genome, so the cache is cleared.
+        
+        Time Complexity: O(M) amortized where M is the length of more for backend "suffix_tree", otherwise the time of
+                         building the index of the longer genome
+        Space Complexity: O(M) where M is the length of more for backend "suffix_tree", otherwise the size of the index
+        """
+        
+        if self._mapped is not None:
+            raise TypeError("an OrfFinder from open() is read only")
+        begin = time.perf_counter() if self.metrics is not None else 0
+        
+        if self.backend == "suffix_tree":
+            self.suffix_index.extend(more)
+        else:
+            self.alphabet.encode(more)
+            # wait for a background build of the shorter genome
+            with self._index_lock:
+                genome = str(self.genome) + more
+                packed_genome = Packed_Genome(genome, self.alphabet) if isinstance(self.genome, Packed_Genome) else None
+                if self.lazy:
+                    self._suffix_index = self._prefix_index = None
+                else:
+                    self._suffix_index = _build_index(self.backend, "suffix", genome, self.alphabet, packed_genome, self.metrics)
+                    self._prefix_index = _build_index(self.backend, "prefix", genome, self.alphabet, packed_genome, self.metrics)
+                self.genome = packed_genome if packed_genome is not None else genome
+            if self.lazy == "background":
+                self._builder = threading.Thread(target=self._build_all, daemon=True)
+                self._builder.start()
+        # the old view is still valid for whoever has it, the next one has the new letters
+        self._genome_view = None
+        with self._cache_lock:
+            self._version += 1
+            if self.cache is not None:
+                self.cache.clear()
+        
+        if self.metrics is not None:
+            self.metrics.observe("orf_finder_extend_seconds", time.perf_counter() - begin, len(more))
+    
+    def _sorted_index(self, start, end):
+        
+        """
+        Input: start and end strings
+        Output: the sorted list of start index, the sorted list of end index, and the smallest end index minus start index
+                where start and end don't overlap
+        """
+        
+        start_list = self._positions("suffix", start)
+        end_list = self._positions("prefix", end)
+        # end - start + 1 >= len(start) + len(end) and start < end
+        least_distance = max(len(start) + len(end) - 1, 1)
+        return start_list, end_list, least_distance
+    
+    def _record_candidates(self, start, end, start_list, end_list):
+        
+        """
+        Input: start and end strings and their sorted lists of index
+        Output: record the number of start index and end index in the metrics, and the number of index the sweep of _join
+                looks at (each start index and each end index once), the work of find is these steps plus the substrings
+                in orf_finder_pairs_emitted_total, a query with many steps but few substrings is slow for its output
+        """
+        
+        self.metrics.observe("orf_finder_start_positions", len(start_list), start)
+        self.metrics.observe("orf_finder_end_positions", len(end_list), end)
+        self.metrics.count("orf_finder_sweep_steps_total", len(start_list) + len(end_list))
     
+    def _join(self, start_list, end_list, least_distance, make):
+        
+        """
+        Input: sorted list of start index and end index, least_distance from _sorted_index, make is a function from _make
+        Output: a generator of make(start, end) for every start and end that don't overlap, in the order of find()
+        """
+        
+        first = 0
         for start in start_list:
-            for end in end_list:
-                if abs(end-start) + 1 >= least_sub_length and start<end:     # check if the string is overlapped
-                    w = self.genome[start-1:end]
-                    out_list.append(w)     
-        return(out_list)
+            # skip the end index that overlaps with this start, they also overlap with every later start
+            while first < len(end_list) and end_list[first] < start + least_distance:
+                first += 1
+            for i in range(len(end_list) - 1, first - 1, -1):
+                yield make(start, end_list[i])
+    
+    def _make(self, form):
+        
+        """
+        Input: form is "string", "span" or "memoryview"
+        Output: a function that makes the result for a start index and end index
+        """
+        
+        if form == "string":
+            genome = self.genome
+            return lambda start, end: genome[start-1:end]
+        elif form == "span":
+            return lambda start, end: (start, end)
+        elif form == "memoryview":
+            genome = self.genome_view()
+            return lambda start, end: genome[start-1:end]
+        else:
+            raise ValueError("unknown form %r" % (form,))
+    
+    def genome_view(self):
+        
+        """
+        Output: a read only memoryview of the bytes of the genome
+        
+        The bytes are shared with the Suffix Array or the memory map when there is one, otherwise the genome is encoded once
+        (a Packed_Genome is decoded once, the bytes of a Suffix Tree are copied once after each extend).
+        
+        Time Complexity: O(N) the first time where N is the length of the genome, O(1) after that
+        Space Complexity: O(N) the first time where N is the length of the genome, O(1) after that
+        """
+        
+        if self._genome_view is None:
+            if self.backend == "suffix_tree":
+                # a view of the bytearray would stop extend() from adding to it
+                view = memoryview(bytes(self.genome.view))
+            elif isinstance(self.genome, Mapped_Genome):
+                view = self.genome.view
+            elif isinstance(self._suffix_index, Suffix_Array) and not isinstance(self.genome, Packed_Genome):
+                view = memoryview(self.suffix_index.text)
+            else:
+                view = memoryview(str(self.genome).encode("latin-1"))
+            self._genome_view = view.toreadonly()
+        return self._genome_view
+    
+    def save(self, path):
+        
+        """
+        Input: path of the file
+        Output: write the genome and its index to the file so it can be opened with OrfFinder.open
+        
+        The file has the letters of the alphabet, the genome and the sa and lcp of the Suffix Array and Prefix Array. For backend "trie" the
+        arrays are built first. The file has a version and a checksum, so open() detects a damaged or old file.
+        
+        Time Complexity: O(N) where N is the length of the genome
+        Space Complexity: O(N) where N is the length of the genome
+        """
+        
+        if self.backend == "suffix_array":
+            suffix_array, prefix_array = self.suffix_index, self.prefix_index
+        else:
+            suffix_array, prefix_array = Suffix_Array(str(self.genome)), Prefix_Array(str(self.genome))
+        text = suffix_array.text
+        if isinstance(text, Packed_Genome):
+            text = str(text).encode("latin-1")
+        _write_index_file(path, _ORF_FINDER_MAGIC, _ORF_FINDER_VERSION,
+                          [self.alphabet.symbols.encode("latin-1"), text, suffix_array.sa, suffix_array.lcp, prefix_array.sa, prefix_array.lcp])
+    
+    @classmethod
+    def open(cls, path, verify=True, metrics=None, cache=None):
+        
+        """
+        Input: path of a file written by save, verify is True to check the checksum of the file, metrics is a Metrics object,
+               cache is an LRU_Cache for the results of find
+        Output: an OrfFinder with backend "suffix_array" that finds directly from a memory map of the file
+        
+        Nothing is rebuilt or copied, so processes that open the same file share one copy in the page cache.
+        A file that is damaged, truncated or from another version raises ValueError.
+        
+        Time Complexity: O(N) where N is the size of the file if verify is True, O(1) otherwise
+        Space Complexity: O(1)
+        """
+        
+        mapped, sections = _open_index_file(path, _ORF_FINDER_MAGIC, _ORF_FINDER_VERSION, verify)
+        symbols, genome, suffix_sa, suffix_lcp, prefix_sa, prefix_lcp = sections
+        arrays = [view.cast("q") for view in (suffix_sa, suffix_lcp, prefix_sa, prefix_lcp)]
+        index = (Suffix_Array.from_arrays(genome, arrays[0], arrays[1]), Prefix_Array.from_arrays(genome, arrays[2], arrays[3]))
+        alphabet = Alphabet(bytes(symbols).decode("latin-1"))
+        finder = cls(Mapped_Genome(genome), backend="suffix_array", index=index, alphabet=alphabet, metrics=metrics, cache=cache)
+        finder._mapped = (mapped, arrays + sections)
+        return finder
+    
+    def close(self):
+        
+        """
+        This function closes the memory map of an OrfFinder from open(), find can't be used after that.
+        The memoryview from start_search and end_search of its index point into the memory map, they must be released first.
+        """
+        
+        if self._genome_view is not None:
+            self._genome_view.release()
+            self._genome_view = None
+        if self._mapped is not None:
+            _close_index_file(*self._mapped)
+            self._mapped = None
             
+
+
+# asyncio front end
+class Async_SequenceDatabase:
+    
+    """
+    This class lets an asyncio program query a SequenceDatabase without blocking the event loop.
+    The work is done in an executor, by default a single worker thread so the database is never used by two threads
+    at once. Queries that arrive in the same turn of the event loop are put together and answered by one executor job,
+    and at most max_pending jobs wait for the executor, after that the callers wait (backpressure).
+    """
+    
+    def __init__(self, database, executor=None, max_pending=4, batch_size=256):
+        
+        """
+        Input: database is a SequenceDatabase, executor is a concurrent.futures executor or None for a single thread,
+               max_pending is the number of executor jobs at once, batch_size is the most queries in one job
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.database = database
+        self.batch_size = batch_size
+        self._own_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=1) if executor is None else executor
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending = []
+        self._tasks = set()
+    
+    async def query(self, q):
+        
+        """
+        Input: q, a string with only [A-D]
+        Output: the same as SequenceDatabase.query
+        
+        The query is added to the current batch. The batch is sent to the executor at the end of this turn of the event
+        loop, or as soon as it has batch_size queries.
+        """
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((q, future))
+        if len(self._pending) == 1:
+            loop.call_soon(self._flush)
+        elif len(self._pending) >= self.batch_size:
+            self._flush()
+        return await future
+    
+    async def addSequence(self, s):
+        
+        """
+        Input: s, a string with only [A-D]
+        Output: insert s into the database in the executor
+        """
+        
+        async with self._slots:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.database.addSequence, s)
+    
+    def _flush(self):
+        
+        """
+        This function sends the current batch of queries to the executor.
+        """
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch):
+        
+        """
+        Input: batch, a list of (query, future)
+        Output: set the result (or the error) of each future
+        """
+        
+        queries = [q for q, future in batch]
+        try:
+            async with self._slots:
+                results = await asyncio.get_running_loop().run_in_executor(self._executor, _query_batch, self.database, queries)
+        except BaseException as error:
+            for q, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (q, future), (ok, result) in zip(batch, results):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+    
+    def close(self):
+        
+        """
+        This function shuts down the executor if it was created by this object.
+        """
+        
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+def _query_batch(database, queries):
+    
+    """
+    Input: a SequenceDatabase and a list of queries
+    Output: a list of (True, result) or (False, error) for each query, so one bad query doesn't fail the whole batch
+    """
+    
+    results = []
+    for q in queries:
+        try:
+            results.append((True, database.query(q)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+class Async_OrfFinder:
+    
+    """
+    This class lets an asyncio program call find on an OrfFinder without blocking the event loop.
+    The substrings are made in chunks of chunk_size, each chunk is one job in the executor (by default a single worker thread).
+    Because a large find is split into many small jobs, other queries can run between its chunks instead of waiting for
+    the whole find. At most max_pending jobs wait for the executor, after that the callers wait (backpressure).
+    """
+    
+    def __init__(self, finder, executor=None, max_pending=4, chunk_size=1024):
+        
+        """
+        Input: finder is an OrfFinder, executor is a concurrent.futures executor or None for a single thread,
+               max_pending is the number of executor jobs at once, chunk_size is the number of substrings in one job
+        
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        
+        self.finder = finder
+        self.chunk_size = chunk_size
+        self._own_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=1) if executor is None else executor
+        self._slots = asyncio.Semaphore(max_pending)
+    
+    async def find_iter(self, start, end, form="string"):
+        
+        """
+        Input: the same as OrfFinder.find_iter
+        Output: an async generator of the same substrings as OrfFinder.find_iter, in the same order
+        """
+        
+        loop = asyncio.get_running_loop()
+        iterator = self.finder.find_iter(start, end, form)
+        while True:
+            async with self._slots:
+                chunk = await loop.run_in_executor(self._executor, _next_chunk, iterator, self.chunk_size)
+            for item in chunk:
+                yield item
+            if len(chunk) < self.chunk_size:
+                return
+    
+    async def find(self, start, end, form="string"):
+        
+        """
+        Input: the same as OrfFinder.find
+        Output: the same list as OrfFinder.find
+        """
+        
+        return [item async for item in self.find_iter(start, end, form)]
+    
+    async def count(self, start, end):
+        
+        """
+        Input: the same as OrfFinder.count
+        Output: the same as OrfFinder.count
+        """
+        
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.finder.count, start, end)
+    
+    def close(self):
+        
+        """
+        This function shuts down the executor if it was created by this object.
+        """
+        
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+def _next_chunk(iterator, size):
+    
+    """
+    Input: an iterator and the size of the chunk
+    Output: a list of the next size items of the iterator, shorter if the iterator ends
+    """
+    
+    return list(itertools.islice(iterator, size))